@@ -1,20 +1,26 @@
-
 #!/usr/bin/env bash
 set -euo pipefail
 mkdir -p models
 cd "$(dirname "$0")"/..
-out="models/movenet_singlepose_lightning.tflite"
-if [ -f "$out" ]; then
-  echo "Model already exists: $out"
-  exit 0
-fi
 
-echo "Attempting to download MoveNet SinglePose Lightning (TFLite) from TF Hub..."
-# Note: TF Hub URLs occasionally change. If this fails, open the TF Hub MoveNet page and download manually.
+# Note: TF Hub URLs occasionally change. If a download fails, open the TF Hub MoveNet page and download manually.
 # https://www.tensorflow.org/hub/tutorials/movenet  (find SinglePose Lightning TFLite)
 # Direct links often look like: https://tfhub.dev/google/lite-model/movenet/singlepose/lightning/tflite/float16/4?lite-format=tflite
-curl -L --fail -o "$out" "https://tfhub.dev/google/lite-model/movenet/singlepose/lightning/tflite/float16/4?lite-format=tflite" || {
-  echo "Automatic download failed. Please visit the TF Hub MoveNet page and download the SinglePose Lightning TFLite model manually, then save it as: $out"
-  exit 1
+fetch() {
+  local out="$1" variant="$2"
+  if [ -f "$out" ]; then
+    echo "Model already exists: $out"
+    return 0
+  fi
+  echo "Attempting to download MoveNet SinglePose Lightning ($variant TFLite) from TF Hub..."
+  curl -L --fail -o "$out" "https://tfhub.dev/google/lite-model/movenet/singlepose/lightning/tflite/$variant/4?lite-format=tflite" || {
+    rm -f "$out"
+    echo "Automatic download failed. Please visit the TF Hub MoveNet page and download the SinglePose Lightning $variant TFLite model manually, then save it as: $out"
+    return 1
+  }
+  echo "Downloaded to $out"
 }
-echo "Downloaded to $out"
+
+fetch "models/movenet_singlepose_lightning.tflite" float16
+# int8 variant (uint8 input) - default in config.yaml; ~2x faster on Pi CPUs. Optional: float16 model is used if missing.
+fetch "models/movenet_singlepose_lightning_int8.tflite" int8 || echo "⚠️ int8 model unavailable; DuruOn will fall back to the float16 model"
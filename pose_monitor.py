@@ -3,151 +3,210 @@
 DuruOn Real-time Pose Monitor - FIXED VERSION
 Shows live pose detection data in a user-friendly format
 """
+import os
+import sys
+import math
 import time
 import subprocess
 import json
-import re
-from datetime import datetime
+import select
+
+# Native journal reader (python3-systemd) skips the journalctl subprocess and text pipe
+try:
+    from systemd import journal  # type: ignore
+    JOURNAL_API_AVAILABLE = True
+except Exception:
+    journal = None  # type: ignore
+    JOURNAL_API_AVAILABLE = False
+
+# Log line markers emitted by src/main.py
+_ACTIVE_TAG = '🔍 ACTIVE:'
+_IDLE_TAG = '💤 IDLE:'
+_ACTIVE_TAG_B = _ACTIVE_TAG.encode('utf-8')
+_IDLE_TAG_B = _IDLE_TAG.encode('utf-8')
+_READ_SIZE = 65536
+
+# key=value token converters (payload is ", " separated)
+_FIELDS = {
+    'frames': int,
+    'torso_angle': lambda s: float(s.rstrip('°')),
+    'vx': float,
+    'vy': float,
+    'event': lambda s: None if s == 'None' else s,
+}
+
+# Posture label per whole degree; index with ceil(angle) so the <= thresholds hold
+_POSTURE = tuple(
+    "🔴 HORIZONTAL (Risk Zone)" if a <= 30 else
+    "🟡 LEANING" if a <= 45 else
+    "🟢 SITTING" if a <= 70 else
+    "🟢 UPRIGHT"
+    for a in range(181)
+)
+
+# [epoch second, formatted HH:MM:SS] - strftime only when the second changes
+_ts_cache = [0, '']
+
+def _timestamp():
+    t = int(time.time())
+    if _ts_cache[0] != t:
+        _ts_cache[:] = [t, time.strftime('%H:%M:%S', time.localtime(t))]
+    return _ts_cache[1]
+
+class PoseStatus:
+    """Parsed log line; a single instance is reused for every line"""
+    __slots__ = ('frames', 'present', 'torso_angle', 'vx', 'vy', 'event', 'timestamp', 'state')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.frames = 0
+        self.present = False
+        self.torso_angle = 0.0
+        self.vx = 0.0
+        self.vy = 0.0
+        self.event = None
+        self.timestamp = None
+        self.state = None
 
 class PoseMonitor:
     def __init__(self):
-        self.last_data = {}
-        
-    def parse_log_line(self, line):
-        """Parse DuruOn log lines"""
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        
-        # Parse ACTIVE logs with pose data
-        active_pattern = r'🔍 ACTIVE: frames=(\d+), torso_angle=([\d.]+)°, vx=([-\d.]+), vy=([-\d.]+)'
-        match = re.search(active_pattern, line)
-        if match:
-            return {
-                'frames': int(match.group(1)),
-                'present': True,
-                'torso_angle': float(match.group(2)),
-                'vx': float(match.group(3)),
-                'vy': float(match.group(4)),
-                'sudden_drop': False,  # Would need risk engine data
-                'rapid_angle_change': False,
-                'angle_change': 0.0,
-                'immobile': False,
-                'event': None,
-                'timestamp': timestamp,
-                'state': 'ACTIVE'
-            }
+        self.last_data = None
+        self._status = PoseStatus()
         
-        # Parse ACTIVE logs with no person
-        no_person_pattern = r'🔍 ACTIVE: frames=(\d+), no person detected'
-        match = re.search(no_person_pattern, line)
-        if match:
-            return {
-                'frames': int(match.group(1)),
-                'present': False,
-                'torso_angle': 0.0,
-                'vx': 0.0,
-                'vy': 0.0,
-                'sudden_drop': False,
-                'rapid_angle_change': False,
-                'angle_change': 0.0,
-                'immobile': False,
-                'event': None,
-                'timestamp': timestamp,
-                'state': 'ACTIVE'
-            }
-        
-        # Parse IDLE logs
-        idle_pattern = r'💤 IDLE: frames=(\d+), PIR monitoring=(\w+)'
-        match = re.search(idle_pattern, line)
-        if match:
-            return {
-                'frames': int(match.group(1)),
-                'present': False,
-                'torso_angle': 0.0,
-                'vx': 0.0,
-                'vy': 0.0,
-                'sudden_drop': False,
-                'rapid_angle_change': False,
-                'angle_change': 0.0,
-                'immobile': False,
-                'event': None,
-                'timestamp': timestamp,
-                'state': 'IDLE'
-            }
-            
-        return None
+    def parse_log_line(self, line, state=None):
+        """Parse DuruOn log lines; `state` ('ACTIVE'/'IDLE') skips tag detection when the caller knows it"""
+        if state is None:
+            state = 'ACTIVE' if _ACTIVE_TAG in line else 'IDLE'
+        _, tag, payload = line.partition(_ACTIVE_TAG if state == 'ACTIVE' else _IDLE_TAG)
+        if not tag:
+            return None
+
+        # Parse into locals first; the shared instance (possibly held as last_data) is only
+        # overwritten once the whole line parsed
+        vals = {}
+        for tok in payload.strip().split(', '):
+            key, sep, val = tok.partition('=')
+            conv = _FIELDS.get(key)
+            if conv is None:
+                continue
+            try:
+                vals[key] = conv(val)
+            except ValueError:
+                return None
+        if 'frames' not in vals:
+            return None
+
+        data = self._status
+        data.reset()
+        for key, val in vals.items():
+            setattr(data, key, val)
+        # Person present only when ACTIVE line carries pose data
+        data.present = state == 'ACTIVE' and 'torso_angle' in vals
+        data.timestamp = _timestamp()
+        data.state = state
+        return data
         
     def display_status(self, data):
         """Display current pose status"""
-        print("\033[2J\033[H", end="")  # Clear screen and move cursor to top
-        print("🚿 DuruOn Real-time Pose Monitor - FIXED")
-        print("=" * 50)
-        print(f"⏰ Last Update: {data['timestamp']}")
-        print(f"📊 Frame Count: {data['frames']}")
-        print(f"🔋 System State: {data.get('state', 'UNKNOWN')}")
-        print()
+        # Build the whole screen and emit it with a single write
+        lines = [
+            "\033[2J\033[H🚿 DuruOn Real-time Pose Monitor - FIXED",  # Clear screen and move cursor to top
+            "=" * 50,
+            f"⏰ Last Update: {data.timestamp}",
+            f"📊 Frame Count: {data.frames}",
+            f"🔋 System State: {data.state or 'UNKNOWN'}",
+            "",
+        ]
         
         # Person detection
-        if data['present']:
-            print("👤 Person Detected: ✅ YES")
-            
-            print()
-            print("📐 Posture Analysis:")
-            print(f"   Torso Angle: {data['torso_angle']:.1f}°")
-            
+        if data.present:
             # Posture interpretation
-            if data['torso_angle'] <= 30:
-                posture = "🔴 HORIZONTAL (Risk Zone)"
-            elif data['torso_angle'] <= 45:
-                posture = "🟡 LEANING"  
-            elif data['torso_angle'] <= 70:
-                posture = "🟢 SITTING"
-            else:
-                posture = "🟢 UPRIGHT"
-            print(f"   Posture: {posture}")
-            
-            print()
-            print("🔄 Vector Data:")
-            print(f"   VX: {data.get('vx', 0):.3f}")
-            print(f"   VY: {data.get('vy', 0):.3f}")
-            
+            posture = _POSTURE[min(180, max(0, math.ceil(data.torso_angle)))]
+            lines += [
+                "👤 Person Detected: ✅ YES",
+                "",
+                "📐 Posture Analysis:",
+                f"   Torso Angle: {data.torso_angle:.1f}°",
+                f"   Posture: {posture}",
+                "",
+                "🔄 Vector Data:",
+                f"   VX: {data.vx:.3f}",
+                f"   VY: {data.vy:.3f}",
+            ]
         else:
-            print("👤 Person Detected: ❌ NO")
-            if data.get('state') == 'IDLE':
-                print("💤 System in IDLE mode - waiting for PIR activation")
+            lines.append("👤 Person Detected: ❌ NO")
+            if data.state == 'IDLE':
+                lines.append("💤 System in IDLE mode - waiting for PIR activation")
             else:
-                print("🔍 System ACTIVE - no person in frame")
+                lines.append("🔍 System ACTIVE - no person in frame")
             
-        print()
-        print("🚨 Alert Status:")
-        if data.get('event'):
-            print(f"   Active Alert: 🚨 {data['event'].upper()}")
+        lines += ["", "🚨 Alert Status:"]
+        if data.event:
+            lines.append(f"   Active Alert: 🚨 {data.event.upper()}")
         else:
-            print("   Active Alert: ✅ NONE")
+            lines.append("   Active Alert: ✅ NONE")
             
-        print()
-        print("💡 Controls:")
-        print("   Ctrl+C to exit")
-        print("   Live updates from DuruOn logs")
+        lines += [
+            "",
+            "💡 Controls:",
+            "   Ctrl+C to exit",
+            "   Live updates from DuruOn logs",
+            "",
+        ]
+        sys.stdout.write("\n".join(lines))
+        sys.stdout.flush()
         
     def monitor(self):
         """Start monitoring pose detection"""
         print("🚀 Starting DuruOn Pose Monitor - FIXED VERSION...")
         print("📡 Connecting to DuruOn logs...")
         
+        if JOURNAL_API_AVAILABLE:
+            try:
+                self._follow_journal()  # only returns when no bathguard entries are readable
+            except KeyboardInterrupt:
+                print("\n🛑 Monitor stopped by user")
+                return
+            except Exception as e:
+                print(f"⚠️ Journal API failed ({e}); falling back to journalctl")
+            else:
+                # Without systemd-journal/adm membership the reader silently sees no system entries
+                print("⚠️ No bathguard entries readable via the journal API "
+                      "(user not in systemd-journal/adm?); falling back to sudo journalctl")
+        
         try:
             # Use journalctl to follow the logs
             process = subprocess.Popen(
                 ['sudo', 'journalctl', '-u', 'bathguard', '-f', '--no-pager'],
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1
+                bufsize=_READ_SIZE
             )
             
-            for line in process.stdout:
-                # Look for ACTIVE or IDLE patterns
-                if ("🔍 ACTIVE:" in line) or ("💤 IDLE:" in line):
-                    data = self.parse_log_line(line)
+            # Read raw chunks and split lines ourselves; only decode tagged lines
+            fd = process.stdout.fileno()
+            buf = bytearray()
+            while True:
+                chunk = os.read(fd, _READ_SIZE)
+                if not chunk:
+                    break
+                buf += chunk
+                lines = buf.split(b'\n')
+                buf = lines.pop()  # trailing partial line
+                for raw in lines:
+                    # Cheap single-token reject; most journal lines are unrelated
+                    if b'frames=' not in raw:
+                        continue
+                    # Look for ACTIVE or IDLE patterns; the matched tag selects the parser
+                    if _ACTIVE_TAG_B in raw:
+                        state = 'ACTIVE'
+                    elif _IDLE_TAG_B in raw:
+                        state = 'IDLE'
+                    else:
+                        continue
+                    data = self.parse_log_line(raw.decode('utf-8', errors='replace'), state)
                     if data:
                         self.last_data = data
                         self.display_status(data)
@@ -160,6 +219,37 @@ class PoseMonitor:
             if 'process' in locals():
                 process.terminate()
 
+    def _follow_journal(self):
+        """Follow bathguard entries via sd_journal; MESSAGE arrives pre-split, no text parsing of the stream.
+        Returns at once when no bathguard entry is visible (caller falls back to journalctl)."""
+        j = journal.Reader()
+        j.add_match(_SYSTEMD_UNIT='bathguard.service')
+        j.seek_tail()
+        if not j.get_previous():
+            return
+        poller = select.poll()
+        poller.register(j, j.get_events())
+        while True:
+            poller.poll()
+            if j.process() != journal.APPEND:
+                continue
+            for entry in j:
+                msg = entry.get('MESSAGE', '')
+                if isinstance(msg, bytes):
+                    msg = msg.decode('utf-8', errors='replace')
+                if 'frames=' not in msg:
+                    continue
+                if _ACTIVE_TAG in msg:
+                    state = 'ACTIVE'
+                elif _IDLE_TAG in msg:
+                    state = 'IDLE'
+                else:
+                    continue
+                data = self.parse_log_line(msg, state)
+                if data:
+                    self.last_data = data
+                    self.display_status(data)
+
 if __name__ == "__main__":
     monitor = PoseMonitor()
     monitor.monitor()
\ No newline at end of file
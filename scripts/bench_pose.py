@@ -1,26 +1,33 @@
 
 # Benchmark MoveNet on a folder of images or from camera; optional.
-# Usage: python -m scripts.bench_pose --model models/movenet_singlepose_lightning.tflite --camera 0
-import argparse, time, cv2, numpy as np
+# Usage: python -m scripts.bench_pose --model models/movenet_singlepose_lightning.tflite --camera 0 [--fourcc MJPG]
+import argparse, sys, time, cv2, numpy as np
 from src.pose_backends.movenet_tflite import MoveNetSinglePose
 
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
     ap.add_argument("--model", required=True)
     ap.add_argument("--camera", type=int, default=None)
+    ap.add_argument("--fourcc", default="MJPG", help="capture FOURCC (empty = driver default)")
     args = ap.parse_args()
 
     backend = MoveNetSinglePose(args.model, num_threads=3)
     if args.camera is not None:
-        cap = cv2.VideoCapture(args.camera)
+        # V4L2 directly on Linux; MJPEG keeps USB bandwidth low so we time the model, not capture
+        api = cv2.CAP_V4L2 if sys.platform.startswith("linux") else cv2.CAP_ANY
+        cap = cv2.VideoCapture(args.camera, api)
+        if args.fourcc:
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*args.fourcc))  # before size/fps
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # drop stale frames
         cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
         cap.set(cv2.CAP_PROP_FRAME_HEIGHT,480)
         cap.set(cv2.CAP_PROP_FPS, 15)
+        buf = backend.alloc_input()  # reused input tensor
         start = time.time(); n=0
         while n < 200:
             ok, frame = cap.read()
             if not ok: break
-            backend.infer(frame)
+            backend.infer(frame, out=buf)
             n+=1
         dur = time.time()-start
         print(f"{n} frames in {dur:.2f}s => {n/dur:.1f} FPS")
@@ -9,17 +9,21 @@ except Exception:
     print("RPi.GPIO not available; nothing to reset.")
     sys.exit(0)
 
-GREEN=int(os.environ.get('DURUON_GREEN_PIN',18))
-BLUE=int(os.environ.get('DURUON_BLUE_PIN',23))
-RED=int(os.environ.get('DURUON_RED_PIN',25))
+# (green, blue, red)
+PINS = tuple(int(os.environ.get(k, d)) for k, d in (
+    ('DURUON_GREEN_PIN', 18), ('DURUON_BLUE_PIN', 23), ('DURUON_RED_PIN', 25)))
 
 GPIO.setmode(GPIO.BCM)
-for pin in (GREEN,BLUE,RED):
-    try:
-        GPIO.setup(pin, GPIO.OUT)
-        GPIO.output(pin, GPIO.LOW)
-    except Exception as e:
-        print(f"Pin {pin} reset error: {e}")
+try:
+    # Bulk setup drives all pins LOW in one call
+    GPIO.setup(list(PINS), GPIO.OUT, initial=GPIO.LOW)
+except Exception:
+    for pin in PINS:
+        try:
+            GPIO.setup(pin, GPIO.OUT)
+            GPIO.output(pin, GPIO.LOW)
+        except Exception as e:
+            print(f"Pin {pin} reset error: {e}")
 
 GPIO.cleanup()
-print(f"LEDs off & GPIO cleaned (pins {GREEN},{BLUE},{RED}).")
+print(f"LEDs off & GPIO cleaned (pins {','.join(map(str, PINS))}).")
@@ -6,17 +6,18 @@ import time
 import threading
 from typing import Callable, Optional
 import logging
-import os
+
+try:  # pragma: no cover
+    from ..shared.hardware import is_raspberry_pi  # type: ignore
+except Exception:
+    from shared.hardware import is_raspberry_pi  # type: ignore
 
 # Only import RPi.GPIO if we're actually on a Pi and not in a container/test environment
 GPIO_AVAILABLE = False
 try:
-    # Check if we're on actual Pi hardware
-    if os.path.exists('/proc/cpuinfo'):
-        with open('/proc/cpuinfo', 'r') as f:
-            if 'raspberry' in f.read().lower():
-                import RPi.GPIO as GPIO
-                GPIO_AVAILABLE = True
+    if is_raspberry_pi():
+        import RPi.GPIO as GPIO
+        GPIO_AVAILABLE = True
 except (ImportError, Exception):
     pass
 
@@ -42,17 +43,20 @@ class PIRActivation:
         self.activation_grace_period = activation_grace_period
         self.auto_sleep_timeout = auto_sleep_timeout
         
-        # State tracking
+        # State tracking (timestamps are time.monotonic(), immune to NTP steps)
         self.is_monitoring = False
         self.last_motion_time = 0
         self.last_trigger_time = 0
         self.grace_period_active = False
+        self._grace_deadline = 0.0
         self.gpio_initialized = False
         
         # Enhanced tracking for logging
         self.pir_trigger_count = 0
         self.last_pir_state = False
         self.last_status_log = 0
+        # Latest PIR level for other threads (edge callback / monitor loop); plain attribute read
+        self.motion_state = False
         
         # Mock mode simulation
         self.mock_motion_counter = 0
@@ -64,6 +68,9 @@ class PIRActivation:
         # Threading
         self.running = False
         self.monitor_thread: Optional[threading.Thread] = None
+        # Edge-triggered wakeups (hardware mode); falls back to 5Hz polling
+        self.edge_detect = False
+        self._edge_event = threading.Event()
         
         self.logger = logging.getLogger('DuruOn.PIR')
         
@@ -93,24 +100,43 @@ class PIRActivation:
             initial_state = GPIO.input(self.pir_pin)
             self.logger.info(f"📡 Initial PIR state: {'HIGH (motion)' if initial_state else 'LOW (no motion)'}")
             
+            # Let the kernel wake us on PIR edges instead of polling
+            try:
+                GPIO.add_event_detect(self.pir_pin, GPIO.BOTH, callback=self._on_edge)
+                self.edge_detect = True
+                self.logger.info(f"⚡ PIR edge detection enabled on GPIO {self.pir_pin}")
+            except Exception as e:
+                self.logger.warning(f"⚠️  PIR edge detection unavailable ({e}) - polling at 5Hz")
+            
         except Exception as e:
             self.logger.error(f"❌ Failed to setup PIR sensor: {e}")
             self.logger.info("🔄 Falling back to MOCK mode")
             self.gpio_initialized = False
             
+    def _on_edge(self, channel):
+        """GPIO edge callback - latch the new level and wake the monitor loop"""
+        try:
+            self.motion_state = GPIO.input(channel) == GPIO.HIGH
+        except Exception:
+            pass
+        self._edge_event.set()
+        
+    def _next_wakeup(self, current_time: float) -> float:
+        """Seconds until the monitor loop has timed work to do (status log / auto-sleep)"""
+        deadline = self.last_status_log + 60
+        if self.grace_period_active:
+            deadline = min(deadline, self._grace_deadline)
+        if self.is_monitoring and not self.last_pir_state:
+            deadline = min(deadline, self.last_motion_time + self.auto_sleep_timeout)
+        return max(0.0, deadline - current_time)
+        
     def _read_pir(self) -> bool:
         """Read PIR sensor state"""
         if not GPIO_AVAILABLE or not self.gpio_initialized:
-            # Mock PIR for testing - simulate motion every ~8-12 seconds
-            self.mock_motion_counter += 1
-            
-            # Simulate motion detection pattern
-            if self.mock_motion_counter >= 40:  # ~8 seconds at 5Hz polling
-                if self.mock_motion_counter <= 45:  # Motion for ~1 second
-                    return True
-                elif self.mock_motion_counter >= 60:  # Reset after 12 seconds
-                    self.mock_motion_counter = 0
-            return False
+            # Mock PIR for testing - 12s cycle at 5Hz polling, motion for ~1s after ~8s
+            self.mock_motion_counter = (self.mock_motion_counter + 1) % 60
+            self.motion_state = 40 <= self.mock_motion_counter <= 45
+            return self.motion_state
             
         try:
             current_state = GPIO.input(self.pir_pin) == GPIO.HIGH
@@ -124,6 +150,7 @@ class PIRActivation:
                     self.logger.info(f"🔵 PIR CLEAR - Motion ended on GPIO {self.pir_pin}")
                 self.last_pir_state = current_state
             
+            self.motion_state = current_state
             return current_state
             
         except Exception as e:
@@ -157,10 +184,18 @@ class PIRActivation:
     def stop(self):
         """Stop the PIR monitoring system"""
         self.running = False
+        self._edge_event.set()
         
         if self.monitor_thread:
             self.monitor_thread.join(timeout=2.0)
             
+        if self.edge_detect:
+            try:
+                GPIO.remove_event_detect(self.pir_pin)
+            except Exception:
+                pass
+            self.edge_detect = False
+            
         # Don't cleanup GPIO - let LED system handle it
         self.logger.info("🛑 PIR activation system stopped")
         
@@ -168,14 +203,18 @@ class PIRActivation:
         """Main PIR monitoring loop"""
         while self.running:
             try:
-                current_time = time.time()
+                current_time = time.monotonic()
                 
-                # Read PIR sensor
+                # Read PIR sensor (clear first so an edge during the read is not lost)
+                self._edge_event.clear()
+                was_high = self.last_pir_state
                 motion_detected = self._read_pir()
                 
-                if motion_detected:
+                if motion_detected or was_high:
+                    # Still high, or motion just ended (falling edge)
                     self.last_motion_time = current_time
-                    
+                
+                if motion_detected:
                     # Check if we should activate (with debouncing)
                     if (not self.is_monitoring and 
                         current_time - self.last_trigger_time >= self.debounce_time):
@@ -188,24 +227,32 @@ class PIRActivation:
                       current_time - self.last_motion_time > self.auto_sleep_timeout):
                     self._deactivate_monitoring()
                 
+                # Grace period elapsed -> start full monitoring
+                if self.grace_period_active and current_time >= self._grace_deadline:
+                    self._start_full_monitoring()
+                    
                 # Enhanced status logging every 60 seconds
                 if current_time - self.last_status_log >= 60:
-                    self._log_status()
+                    self._log_status(current_time)
                     self.last_status_log = current_time
                     
-                # Sleep for sensor polling rate
-                time.sleep(0.2)  # 5Hz polling rate
+                if self.edge_detect:
+                    # Sleep until a PIR edge or the next timed check
+                    self._edge_event.wait(self._next_wakeup(current_time))
+                else:
+                    # Sleep for sensor polling rate
+                    time.sleep(0.2)  # 5Hz polling rate
                 
             except Exception as e:
                 self.logger.error(f"Error in PIR monitor loop: {e}")
                 time.sleep(1.0)
     
-    def _log_status(self):
+    def _log_status(self, current_time: float):
         """Log detailed PIR system status"""
         mode = "HARDWARE" if (GPIO_AVAILABLE and self.gpio_initialized) else "MOCK"
         status = "MONITORING" if self.is_monitoring else "IDLE"
         
-        time_since_motion = time.time() - self.last_motion_time if self.last_motion_time else 0
+        time_since_motion = current_time - self.last_motion_time if self.last_motion_time else 0
         auto_sleep_in = max(0, self.auto_sleep_timeout - time_since_motion) if self.last_motion_time else 0
         
         self.logger.info(f"📊 PIR Status: {mode} mode, {status}, "
@@ -215,7 +262,7 @@ class PIRActivation:
                 
     def _activate_monitoring(self):
         """Activate full DuruOn monitoring"""
-        if self.is_monitoring:
+        if self.is_monitoring or self.grace_period_active:
             return
             
         mode_indicator = "🔴" if (GPIO_AVAILABLE and self.gpio_initialized) else "🟠"
@@ -224,23 +271,13 @@ class PIRActivation:
         # Grace period
         if self.activation_grace_period > 0:
             self.logger.info(f"⏱️  Grace period: {self.activation_grace_period:.0f}s before full monitoring")
+            # Checked by the monitor loop - no extra timer thread
+            self._grace_deadline = time.monotonic() + self.activation_grace_period
             self.grace_period_active = True
-            
-            # Start grace period in separate thread
-            grace_thread = threading.Thread(
-                target=self._grace_period_timer, 
-                daemon=True
-            )
-            grace_thread.start()
+            self._edge_event.set()
         else:
             self._start_full_monitoring()
             
-    def _grace_period_timer(self):
-        """Handle grace period before starting full monitoring"""
-        time.sleep(self.activation_grace_period)
-        if self.running and self.grace_period_active:
-            self._start_full_monitoring()
-            
     def _start_full_monitoring(self):
         """Start full monitoring after grace period"""
         self.is_monitoring = True
@@ -275,7 +312,7 @@ class PIRActivation:
                 
     def update_motion(self):
         """Update motion timestamp (call this when person detected via pose)"""
-        self.last_motion_time = time.time()
+        self.last_motion_time = time.monotonic()
         
     def force_activate(self):
         """Manually activate monitoring (for testing)"""
@@ -289,7 +326,7 @@ class PIRActivation:
         
     def get_status(self) -> dict:
         """Get current PIR system status"""
-        current_time = time.time()
+        current_time = time.monotonic()
         
         return {
             "is_monitoring": self.is_monitoring,
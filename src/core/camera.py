@@ -0,0 +1,87 @@
+import os
+import threading
+import time
+from typing import Optional, Tuple, Any, Iterable
+
+class CameraWorker(threading.Thread):
+    """Continuously drains a cv2.VideoCapture and keeps only the newest frame.
+
+    Decoding (retrieve) is skipped while `want_decode` is False so an idle
+    system only advances the driver queue. Readers get the freshest frame
+    regardless of how long their own processing took.
+
+    The worker owns the capture once started: it calls cap.release() itself
+    after its loop exits, so the native object is never released (or reused)
+    while grab() is still running on it.
+    """
+    def __init__(self, cap, cpus: Optional[Iterable[int]] = None):
+        super().__init__(daemon=True, name="camera-worker")
+        self.cap = cap
+        self.cpus = set(cpus) if cpus else None  # e.g. the LITTLE cluster; None = inherit
+        self.want_decode = True
+        self.ok = True
+        self._cond = threading.Condition()
+        self._latest: Optional[Tuple[float, Any]] = None  # (timestamp, frame or None)
+        self._seq = 0
+        self._read_seq = 0
+        self._stop_evt = threading.Event()
+
+    def run(self):
+        try:
+            self._loop()
+        finally:
+            with self._cond:  # also covers grab()/retrieve() raising
+                self.ok = False
+                self._cond.notify_all()
+            try:
+                self.cap.release()
+            except Exception:
+                pass
+
+    def _loop(self):
+        if self.cpus:
+            try:
+                os.sched_setaffinity(0, self.cpus)  # this thread only (Linux)
+            except (AttributeError, OSError) as e:
+                print(f"⚠️ Could not pin camera worker to CPUs {sorted(self.cpus)}: {e}")
+        while not self._stop_evt.is_set():
+            ok = self.cap.grab()
+            frame = None
+            if ok and self.want_decode:
+                ok, frame = self.cap.retrieve()
+            with self._cond:
+                if not ok:
+                    self.ok = False
+                    self._cond.notify_all()
+                    return
+                self._latest = (time.time(), frame)
+                self._seq += 1
+                self._cond.notify_all()
+
+    def snapshot(self) -> Tuple[bool, Optional[Tuple[float, Any]]]:
+        """Return (ok, (ts, frame)) for the newest frame without waiting."""
+        with self._cond:
+            return self.ok, self._latest
+
+    def read(self, timeout: float = 1.0) -> Tuple[bool, Any]:
+        """Wait for a frame newer than the last one read; (False, None) on failure or timeout.
+        While want_decode is set, frames grabbed before decoding was requested are skipped."""
+        def ready():
+            if not self.ok:
+                return True
+            return self._seq != self._read_seq and (self._latest[1] is not None or not self.want_decode)
+        with self._cond:
+            if not self._cond.wait_for(ready, timeout):
+                return False, None
+            if not self.ok:
+                return False, None
+            self._read_seq = self._seq
+            return True, self._latest[1]
+
+    def stop(self, timeout: float = 1.0) -> bool:
+        """Ask the loop to exit; True once the thread is gone (capture released).
+        False when it is still blocked in grab() - it releases the capture when that returns."""
+        self._stop_evt.set()
+        if self.is_alive():
+            self.join(timeout)
+        return not self.is_alive()
@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+from typing import Tuple
+
+def _section(cfg: dict, key: str) -> dict:
+    v = cfg.get(key) if isinstance(cfg, dict) else None
+    return v if isinstance(v, dict) else {}
+
+def _gst(v) -> str:
+    """camera.gst_pipeline: true -> "auto" (built-in pipeline), a string -> custom pipeline, else disabled."""
+    if v is True:
+        return "auto"
+    return v.strip() if isinstance(v, str) else ""
+
+def _cpus(v) -> Tuple[int, ...]:
+    """CPU id list from config (e.g. [4, 5, 6, 7]); empty = leave affinity alone."""
+    return tuple(int(c) for c in v) if isinstance(v, (list, tuple)) else ()
+
+@dataclass(frozen=True, slots=True)
+class AppSettings:
+    """Runtime settings used by the main loop, extracted once from the YAML config."""
+    # backend
+    backend_type: str = "movenet_tflite"
+    motion_skip_eps: float = 0.0
+    batch_size: int = 1
+    temporal_skip: int = 1
+    infer_cpus: Tuple[int, ...] = ()
+    # camera
+    camera_enabled: bool = True
+    camera_index: int = 0
+    cam_width: int = 640
+    cam_height: int = 480
+    cam_fourcc: str = "MJPG"
+    cam_req_fps: int = 15
+    cam_verify_fps: bool = False
+    cam_gst_pipeline: str = ""
+    cam_auto_minimize: bool = False
+    capture_cpus: Tuple[int, ...] = ()
+    retry_interval_s: float = 5.0
+    error_notify_interval_s: float = 60.0
+    reopen_verbose: bool = True
+    release_when_idle: bool = True
+    # process
+    pid_file: str = "duruon.pid"
+    # alerting
+    heartbeat_enabled: bool = False
+    heartbeat_interval: float = 86400.0
+    # logging
+    active_debug_interval: float = 30.0
+    idle_debug_interval: float = 120.0
+    status_debug: bool = True
+    presence_min_persist_s: float = 2.0
+    min_log_gap_s: float = 1.5
+    # debug instrumentation
+    debug_save_frames: bool = False
+    debug_frame_dir: str = "debug_frames"
+    debug_save_interval: float = 10.0
+    debug_save_on_state_change: bool = True
+    debug_max_frames: int = 200
+    debug_brightness_warn_interval: float = 60.0
+    risk_verbose: bool = False
+    risk_verbose_interval: float = 5.0
+    risk_snapshot_interval: float = 0.0
+    keypoint_dump: bool = True
+    keypoint_dump_top_n: int = 6
+    risk_verbose_compact: bool = True
+    presence_grace_frames: int = 5
+
+    @classmethod
+    def from_dict(cls, cfg: dict) -> "AppSettings":
+        backend = _section(cfg, "backend")
+        camera = _section(cfg, "camera")
+        heartbeat = _section(_section(cfg, "alerting"), "heartbeat")
+        log_cfg = _section(cfg, "logging")
+        debug = _section(cfg, "debug")
+        return cls(
+            backend_type=str(backend.get("type", "movenet_tflite")),
+            motion_skip_eps=float(backend.get("motion_skip_eps", 0.0)),
+            batch_size=max(1, int(backend.get("batch_size", 1))),
+            temporal_skip=max(1, int(backend.get("temporal_skip", 1))),
+            infer_cpus=_cpus(backend.get("cpus")),
+            camera_enabled=bool(camera.get("enabled", True)),
+            camera_index=int(camera.get("index", 0)),
+            cam_width=int(camera.get("width", 640)),
+            cam_height=int(camera.get("height", 480)),
+            cam_fourcc=str(camera.get("fourcc", "MJPG") or ""),
+            cam_req_fps=int(camera.get("fps", 15)),
+            cam_verify_fps=bool(camera.get("verify_fps", False)),
+            cam_gst_pipeline=_gst(camera.get("gst_pipeline")),
+            cam_auto_minimize=bool(camera.get("auto_minimize", False)),
+            capture_cpus=_cpus(camera.get("cpus")),
+            retry_interval_s=float(camera.get("retry_interval_s", 5.0)),
+            error_notify_interval_s=float(camera.get("error_notify_interval_s", 60.0)),
+            reopen_verbose=bool(camera.get("reopen_verbose", True)),
+            release_when_idle=bool(camera.get("release_when_idle", True)),
+            pid_file=str(cfg.get("pid_file", "duruon.pid")),
+            heartbeat_enabled=bool(heartbeat.get("enabled", False)),
+            heartbeat_interval=float(heartbeat.get("interval_s", 86400.0)),
+            active_debug_interval=float(log_cfg.get("active_debug_interval_s", 30.0)),
+            idle_debug_interval=float(log_cfg.get("idle_debug_interval_s", 120.0)),
+            status_debug=bool(log_cfg.get("status_debug", True)),
+            presence_min_persist_s=float(log_cfg.get("presence_min_persist_s", 2.0)),
+            min_log_gap_s=float(log_cfg.get("presence_min_log_gap_s", 1.5)),
+            debug_save_frames=bool(debug.get("save_frames", False)),
+            debug_frame_dir=str(debug.get("frame_dir", "debug_frames")),
+            debug_save_interval=float(debug.get("save_interval_s", 10.0)),
+            debug_save_on_state_change=bool(debug.get("save_on_state_change", True)),
+            debug_max_frames=int(debug.get("max_frames", 200)),
+            debug_brightness_warn_interval=float(debug.get("brightness_warn_interval_s", 60.0)),
+            risk_verbose=bool(debug.get("risk_verbose", False)),
+            risk_verbose_interval=float(debug.get("risk_verbose_interval_s", 5.0)),
+            risk_snapshot_interval=float(debug.get("risk_snapshot_every_s", 0.0)),  # 0 = disabled
+            keypoint_dump=bool(debug.get("keypoint_dump", True)),
+            keypoint_dump_top_n=int(debug.get("keypoint_dump_top_n", 6)),  # weakest N keypoints
+            risk_verbose_compact=bool(debug.get("risk_verbose_compact", True)),
+            presence_grace_frames=int(debug.get("presence_grace_frames", 5)),  # missing frames tolerated
+        )
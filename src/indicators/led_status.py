@@ -7,23 +7,26 @@ import time
 import threading
 from typing import Optional
 import logging
-import os
+
+try:  # pragma: no cover
+    from ..shared.hardware import is_raspberry_pi  # type: ignore
+except Exception:
+    from shared.hardware import is_raspberry_pi  # type: ignore
 
 # Only import RPi.GPIO if available and not in problematic environment
 GPIO_AVAILABLE = False
 try:
-    # Check if we're on actual Pi hardware and not in a container/test environment
-    if os.path.exists('/proc/cpuinfo'):
-        with open('/proc/cpuinfo', 'r') as f:
-            if 'raspberry' in f.read().lower():
-                import RPi.GPIO as GPIO
-                GPIO_AVAILABLE = True
+    if is_raspberry_pi():
+        import RPi.GPIO as GPIO
+        GPIO_AVAILABLE = True
 except (ImportError, Exception):
     pass
 
 class LEDStatus:
     """LED status indicator system for DuruOn"""
     
+    TICK_S = 0.1  # blink pattern resolution (seconds)
+    
     def __init__(self, 
                  green_pin: int = 18,  # System status
                  blue_pin: int = 23,   # PIR activity
@@ -49,13 +52,13 @@ class LEDStatus:
         self.running = False
         self.led_thread: Optional[threading.Thread] = None
         
-        # Timing
+        # Timing (blink patterns are phase-locked to a 100ms tick from _t0)
         self.last_pir_flash = 0
-        self.blink_state = False
-        self.blink_counter = 0
+        self._t0 = time.monotonic()
+        self._wake = threading.Event()
         
-        # Mock mode state tracking
-        self._last_led_states = {}
+        # Last written (green, blue, red) triple; None forces the first write
+        self._last_led_states: Optional[tuple] = None
         self.gpio_working = GPIO_AVAILABLE
         
         self.logger = logging.getLogger('DuruOn.LED')
@@ -72,14 +75,8 @@ class LEDStatus:
             
         try:
             GPIO.setmode(GPIO.BCM)
-            GPIO.setup(self.green_pin, GPIO.OUT)
-            GPIO.setup(self.blue_pin, GPIO.OUT)
-            GPIO.setup(self.red_pin, GPIO.OUT)
-            
             # Start with all LEDs off
-            GPIO.output(self.green_pin, GPIO.LOW)
-            GPIO.output(self.blue_pin, GPIO.LOW)
-            GPIO.output(self.red_pin, GPIO.LOW)
+            GPIO.setup(self._pins(), GPIO.OUT, initial=GPIO.LOW)
             
             self.logger.info(f"✅ LED indicators initialized: Green={self.green_pin}, Blue={self.blue_pin}, Red={self.red_pin}")
             print(f"💡 LED Status: Hardware mode - Green={self.green_pin}, Blue={self.blue_pin}, Red={self.red_pin}")
@@ -89,21 +86,29 @@ class LEDStatus:
             print(f"⚠️  LED Status: Hardware setup failed, falling back to MOCK mode")
             self.gpio_working = False
             
-    def _set_led(self, pin: int, state: bool):
-        """Set LED state (with mock support)"""
+    def _pins(self) -> list:
+        return [self.green_pin, self.blue_pin, self.red_pin]
+        
+    def _set_leds(self, green: bool, blue: bool, red: bool):
+        """Set all three LEDs at once, skipping the write when nothing changed (with mock support)"""
+        states = (green, blue, red)
+        last = self._last_led_states
+        if states == last:
+            return
         if GPIO_AVAILABLE and self.gpio_working:
             try:
-                GPIO.output(pin, GPIO.HIGH if state else GPIO.LOW)
+                GPIO.output(self._pins(), [GPIO.HIGH if st else GPIO.LOW for st in states])
             except Exception as e:
-                self.logger.error(f"Error controlling LED {pin}: {e}")
+                self.logger.error(f"Error controlling LEDs {self._pins()}: {e}")
                 self.gpio_working = False
+                return
         else:
-            # Mock mode - only log state changes to reduce spam
-            led_name = {self.green_pin: "🟢 GREEN", self.blue_pin: "🔵 BLUE", self.red_pin: "🔴 RED"}.get(pin, f"PIN{pin}")
-            if self._last_led_states.get(pin) != state:
-                state_str = "ON" if state else "OFF"
-                print(f"💡 {led_name} LED: {state_str}")
-                self._last_led_states[pin] = state
+            # Mock mode - one line listing only the LEDs that changed
+            names = ("🟢 GREEN", "🔵 BLUE", "🔴 RED")
+            changed = [f"{names[i]} {'ON' if st else 'OFF'}" for i, st in enumerate(states)
+                       if last is None or last[i] != st]
+            print(f"💡 LED: {', '.join(changed)}")
+        self._last_led_states = states
             
     def start(self):
         """Start LED status system"""
@@ -121,6 +126,7 @@ class LEDStatus:
     def stop(self):
         """Stop LED status system"""
         self.running = False
+        self._wake.set()
         
         if self.led_thread:
             self.led_thread.join(timeout=2.0)
@@ -128,9 +134,7 @@ class LEDStatus:
         # Turn off all LEDs and cleanup GPIO
         if GPIO_AVAILABLE and self.gpio_working:
             try:
-                GPIO.output(self.green_pin, GPIO.LOW)
-                GPIO.output(self.blue_pin, GPIO.LOW)
-                GPIO.output(self.red_pin, GPIO.LOW)
+                GPIO.output(self._pins(), GPIO.LOW)
                 self.logger.info("🔧 GPIO cleanup: All LEDs turned OFF")
                 GPIO.cleanup()
                 self.logger.info("🧹 GPIO cleanup completed")
@@ -142,61 +146,77 @@ class LEDStatus:
         self.logger.info("🛑 DuruOn LED indicators stopped")
         print("🛑 LED Status: Indicators stopped")
         
+    @staticmethod
+    def _blink(tick: int, period: int, on_ticks: int):
+        """Return (state, tick of next transition) for a periodic blink pattern"""
+        phase = tick % period
+        if phase < on_ticks:
+            return True, tick - phase + on_ticks
+        return False, tick - phase + period
+        
+    def _compute_leds(self, now: float):
+        """Return ((green, blue, red), next wake time or None when all LEDs are steady)"""
+        tick = int((now - self._t0) / self.TICK_S)
+        next_ticks = []
+        
+        # Green LED (System Status)
+        if self.system_status == "starting":
+            # Fast blink during startup
+            green, nt = self._blink(tick, 2, 1)
+            next_ticks.append(nt)
+        elif self.system_status == "idle":
+            # Slow blink when idle
+            green, nt = self._blink(tick, 10, 2)
+            next_ticks.append(nt)
+        elif self.system_status in ("active", "error"):
+            # Solid on when active; error was always-on under the old tick loop
+            green = True
+        else:
+            green = False
+            
+        # Blue LED (PIR Status)
+        flash_end = None
+        if self.pir_status == "triggered" and now - self.last_pir_flash < 2.0:
+            # Quick flash for PIR trigger (2 second flash only), then off until
+            # an explicit monitoring status
+            blue, nt = self._blink(tick, 2, 1)
+            next_ticks.append(nt)
+            flash_end = self.last_pir_flash + 2.0
+        else:
+            # Solid on during active monitoring, off when clear or idle
+            blue = self.pir_status == "monitoring"
+            
+        # Red LED (Alert Status)
+        if self.alert_status == "soft":
+            # Slow blink for soft alert
+            red, nt = self._blink(tick, 10, 5)
+            next_ticks.append(nt)
+        elif self.alert_status == "emergency":
+            # Fast blink for emergency
+            red, nt = self._blink(tick, 4, 2)
+            next_ticks.append(nt)
+        else:
+            red = False
+            
+        wake_at = None
+        if next_ticks:
+            wake_at = self._t0 + min(next_ticks) * self.TICK_S
+        if flash_end is not None and (wake_at is None or flash_end < wake_at):
+            wake_at = flash_end
+        return (green, blue, red), wake_at
+        
     def _led_loop(self):
-        """Main LED control loop"""
+        """Main LED control loop - sleeps until the next blink transition or status change"""
         while self.running:
             try:
-                current_time = time.time()
-                self.blink_counter += 1
-                
-                # Update blink state (500ms cycle)
-                if self.blink_counter % 5 == 0:
-                    self.blink_state = not self.blink_state
-                
-                # Control Green LED (System Status)
-                if self.system_status == "starting":
-                    # Fast blink during startup
-                    self._set_led(self.green_pin, self.blink_counter % 2 == 0)
-                elif self.system_status == "idle":
-                    # Slow blink when idle
-                    self._set_led(self.green_pin, self.blink_counter % 10 < 2)
-                elif self.system_status == "active":
-                    # Solid on when active
-                    self._set_led(self.green_pin, True)
-                elif self.system_status == "error":
-                    # Very fast blink on error
-                    self._set_led(self.green_pin, self.blink_counter % 1 == 0)
-                else:
-                    self._set_led(self.green_pin, False)
-                
-                # Control Blue LED (PIR Status)
-                if self.pir_status == "triggered":
-                    # Quick flash for PIR trigger (2 second flash only)
-                    if current_time - self.last_pir_flash < 2.0:
-                        self._set_led(self.blue_pin, self.blink_counter % 2 == 0)
-                    else:
-                        # After flash, turn off - wait for explicit monitoring status
-                        self._set_led(self.blue_pin, False)
-                elif self.pir_status == "monitoring":
-                    # Solid on during active monitoring
-                    self._set_led(self.blue_pin, True)
-                else:
-                    # Off when clear or idle
-                    self._set_led(self.blue_pin, False)
-                
-                # Control Red LED (Alert Status)
-                if self.alert_status == "soft":
-                    # Slow blink for soft alert
-                    self._set_led(self.red_pin, self.blink_counter % 10 < 5)
-                elif self.alert_status == "emergency":
-                    # Fast blink for emergency
-                    self._set_led(self.red_pin, self.blink_counter % 4 < 2)
-                else:
-                    # Off when no alert
-                    self._set_led(self.red_pin, False)
+                self._wake.clear()
+                now = time.monotonic()
+                leds, wake_at = self._compute_leds(now)
+                self._set_leds(*leds)
                 
-                # Sleep for 100ms (10Hz update rate)
-                time.sleep(0.1)
+                # Block indefinitely while every LED is steady
+                timeout = None if wake_at is None else max(0.0, wake_at - time.monotonic())
+                self._wake.wait(timeout)
                 
             except Exception as e:
                 self.logger.error(f"Error in LED control loop: {e}")
@@ -205,18 +225,23 @@ class LEDStatus:
     def set_system_status(self, status: str):
         """Set system status: starting, idle, active, error"""
         self.system_status = status
+        self._wake.set()
         self.logger.info(f"🟢 System status: {status.upper()}")
         
     def set_pir_status(self, status: str):
         """Set PIR status: clear, triggered, monitoring"""
         if status == "triggered":
-            self.last_pir_flash = time.time()
+            self.last_pir_flash = time.monotonic()
         self.pir_status = status
+        self._wake.set()
         self.logger.info(f"🔵 PIR status: {status.upper()}")
         
     def set_alert_status(self, status: str):
         """Set alert status: none, soft, emergency"""
+        if status == self.alert_status:
+            return  # called every frame from the main loop; only changes matter
         self.alert_status = status
+        self._wake.set()
         self.logger.info(f"🔴 Alert status: {status.upper()}")
         
     def flash_pir(self):
@@ -1,4 +1,7 @@
-import os, time, signal, sys, argparse, yaml
+import os, time, signal, sys, argparse, logging, threading, queue, yaml
+import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 os.environ.setdefault("PYTHONUNBUFFERED","1")  # ensure unbuffered if service missed flag
 try:
     import cv2
@@ -13,6 +16,30 @@ from .notify.telegram import TelegramNotifier, DummyNotifier
 from .pose_backends.mock_pose import MockBackend, sequence_hard_fall
 from .pose_backends.movenet_tflite import MoveNetSinglePose
 from .utils.skeleton_draw import render_skeleton_image
+from .core.camera import CameraWorker
+from .core.settings import AppSettings
+from .shared.pose import COCO17
+
+# Periodic ACTIVE/IDLE status lines (parsed by pose_monitor.py) go through this logger at DEBUG
+log = logging.getLogger('DuruOn.Main')
+
+
+class _RepeatFilter(logging.Filter):
+    """Drop DEBUG records whose message template was already emitted within `interval` seconds."""
+    def __init__(self, interval: float = 1.0):
+        super().__init__()
+        self.interval = interval
+        self._last = {}
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG:
+            return True
+        key = (record.name, record.msg)
+        now = record.created
+        if now - self._last.get(key, 0.0) < self.interval:
+            return False
+        self._last[key] = now
+        return True
 
 # Import LED status indicators first to initialize GPIO
 LED_AVAILABLE = False
@@ -30,9 +57,178 @@ try:
 except ImportError:
     print("⚠️  PIR activation module not found - running without PIR sensor")
 
+# libyaml's C loader when available (much faster than the pure-Python SafeLoader)
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader  # type: ignore
+
 def load_config(path: str) -> dict:
-    with open(path, "r") as f:
-        return yaml.safe_load(f)
+    with open(path, "rb") as f:  # bytes: libyaml decodes UTF-8 itself, no TextIOWrapper pass
+        return yaml.load(f, Loader=_YamlLoader)
+
+# risk: section -> RiskConfig fields as (key, cast, default, summary); summary is "always", "if_set"
+# (printed only when present in the config) or None. Defaults here are the deployed ones, not RiskConfig's.
+_RISK_SCHEMA = (
+    ("angle_threshold_deg", float, 50.0, "always"),
+    ("drop_threshold", float, 0.15, "always"),
+    ("drop_window_s", float, 1.0, "always"),
+    ("immobile_window_s", float, 10.0, "always"),
+    ("immobile_motion_eps", float, 0.05, None),
+    ("soft_immobility_s", float, 30.0, "always"),
+    ("hard_immobility_s", float, 60.0, "always"),
+    ("fast_fall_immobility_s", float, 12.0, "if_set"),
+    ("cooldown_s", float, 600.0, None),
+    ("confirm_grace_s", float, 6.0, None),
+    ("movement_tolerance_low_angle", float, 0.12, None),
+    ("movement_tolerance_high_angle", float, 0.05, None),
+    ("shower_mode_enabled", bool, True, None),
+    ("shower_start_hour", int, 6, None),
+    ("shower_end_hour", int, 22, None),
+    ("shower_duration_multiplier", float, 4.0, None),
+    ("angle_change_threshold", float, 30.0, "if_set"),
+    ("position_change_threshold", float, 0.15, "if_set"),
+    ("min_kp_confidence", float, 0.10, "if_set"),
+)
+
+# Risk-verbose debug lines (risk_verbose_compact on / off); fields read from RiskMetrics attributes
+_RISK_DBG_COMPACT = (
+    "🧪 RISK DBG: pres={present} raw={m.present} evt={m.event} ang={m.torso_angle:.0f}° drop={m.sudden_drop} "
+    "imm={m.immobile} dy={m.vertical_dy:.3f} dAngT={m.angle_change_total:.1f} pos={m.position_change_total:.3f} "
+    "cmp[d:{m.drop_component_dy} a:{m.drop_component_angle} p:{m.drop_component_pos}] miss={miss}/{grace} "
+    "fb={m.fallback_used} sc={score:.2f}{extra}"
+)
+_RISK_DBG_FULL = (
+    "🧪 RISK DBG: present={m.present} event={m.event} angle={m.torso_angle:.1f} sudden_drop={m.sudden_drop} "
+    "dy={m.vertical_dy:.3f} angleΔ={m.angle_change:.1f} totalAngleΔ={m.angle_change_total:.1f} "
+    "motion_eps={m.adaptive_motion_eps:.3f} immobile={m.immobile} softT={m.adaptive_soft_threshold:.1f}s "
+    "hardT={m.adaptive_hard_threshold:.1f}s vx={m.debug_vx:.3f} vy={m.debug_vy:.3f} score={score:.2f}{extra}"
+)
+
+# Presence combo codes: (camera person << 1) | PIR motion
+_COMBO_CLEAR, _COMBO_PIR, _COMBO_CAMERA, _COMBO_DUAL = 0, 1, 2, 3
+# Presence log lines indexed by combo code (accepted transition / periodic reminder)
+_COMBO_MSG = (
+    "👻 BOTH CLEAR: no person & PIR clear (idle countdown)",
+    "📡 PIR ONLY: motion detected; no person in camera (countdown continues)",
+    "📷 CAMERA ONLY: person detected; PIR clear (countdown continues)",
+    "✅ DUAL DETECTION: Camera + PIR both detect presence (timer reset)",
+)
+_COMBO_MSG_PERIODIC = (
+    "👻 BOTH CLEAR: (periodic) still idle",
+    "📡 PIR ONLY: (periodic) still motion only",
+    "📷 CAMERA ONLY: (periodic) still person detected",
+    "✅ DUAL DETECTION: (periodic)",
+)
+
+# Alert message pieces (built once; the alert path only formats dynamic fields)
+_EVENT_KO = {
+    'hard_fall': '낙상(확정)',
+    'soft_immobility': '장시간 무동작(1단계)',
+    'hard_immobility': '장시간 무동작(2단계)',
+}
+_ALERT_TMPL = (
+    "🚨 DuruOn 경보: {event}\n"
+    "자세각≈{angle:.0f}° | 급강하={drop} | 무동작={immobile}\n"
+    "시간: {ts}\n"
+    "제어: /pause 로 일시중지, /resume 재개 또는 버튼 사용"
+)
+_ALERT_BUTTONS_RUNNING = (("괜찮아요","ACK_OK"),("오탐지","ACK_FALSE"),("일시중지","PAUSE_MON"),("앱중지","STOP_APP"))
+_ALERT_BUTTONS_PAUSED = (("괜찮아요","ACK_OK"),("오탐지","ACK_FALSE"),("재개","RESUME_MON"),("앱중지","STOP_APP"))
+
+# [epoch second, formatted timestamp] - strftime only when the second changes
+_ts_cache = [0, '']
+
+def _timestamp(t: float) -> str:
+    sec = int(t)
+    if _ts_cache[0] != sec:
+        _ts_cache[:] = [sec, time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(sec))]
+    return _ts_cache[1]
+
+def _send_alert_with_photo(notifier, text: str, buttons, pose):
+    """Alert text followed by the anonymized skeleton snapshot (runs on the notify worker)."""
+    notifier.send_text(text, buttons=buttons)
+    try:
+        img = render_skeleton_image(pose)
+        notifier.send_photo(img, caption="Anonymized pose snapshot")
+    except Exception as e:
+        print("skeleton render failed:", e)
+
+def _debug_snapshot_worker(q: "queue.Queue", notifier):
+    """Render + upload debug pose snapshots off the frame loop; q holds at most the newest pose."""
+    while True:
+        pose = q.get()
+        try:
+            img_dbg = render_skeleton_image(pose)
+            notifier.send_photo(img_dbg, caption="🧪 Debug pose snapshot")
+        except Exception as e:
+            print(f"⚠️ Debug snapshot failed: {e}")
+
+def _callback_poller(notifier, q: "queue.Queue", wake: threading.Event, min_interval: float):
+    """Long-poll Telegram for button presses / commands off the frame loop (daemon thread).
+    Results are queued for the main loop, which is woken to handle them."""
+    backoff = 0.0
+    while True:
+        t0 = time.monotonic()
+        cb_res = notifier.check_callbacks(long_poll_timeout=30)
+        if cb_res is not None:
+            q.put(cb_res)
+            wake.set()
+        if getattr(notifier, 'poll_error', None) is not None:
+            backoff = min(backoff * 2, 60.0) if backoff else 5.0  # network down: 5s, 10s, ... 60s
+            time.sleep(backoff)
+            continue
+        backoff = 0.0
+        # Notifiers without long polling return at once; keep those to one poll per min_interval
+        rest = min_interval - (time.monotonic() - t0)
+        if rest > 0:
+            time.sleep(rest)
+
+def _debug_frame_writer(q: "queue.Queue"):
+    """Encode and write queued (path, frame) debug JPEGs off the frame loop (daemon thread)."""
+    while True:
+        fname, img = q.get()
+        try:
+            if cv2.imwrite(fname, img):
+                print(f"🖼️ Saved debug frame -> {fname}")
+            else:
+                print(f"⚠️ Failed saving debug frame: {fname}")
+        except Exception as e:
+            print(f"⚠️ Failed saving debug frame: {e}")
+
+def _infer_padded(infer_batch, frames: list, timestamps: list, size: int) -> list:
+    """infer_batch() with a partial batch padded to `size` (last frame repeated) so the model input
+    keeps one shape - no resize/allocate_tensors per partial size; poses for the padding are dropped."""
+    n = len(frames)
+    if n < size:
+        frames = frames + [frames[-1]] * (size - n)
+        timestamps = timestamps + [timestamps[-1]] * (size - n)
+    return infer_batch(frames, timestamps)[:n]
+
+def _default_tflite_threads() -> int:
+    """All usable cores but one (left for capture/PIR/LED threads), capped at 4."""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):  # not available on every platform
+        cores = os.cpu_count() or 1
+    return max(1, min(4, cores - 1))
+
+# Last stretch of each pacing wait spent yielding instead of sleeping where timer
+# granularity is coarse (Windows oversleeps by whole ms); Linux sleeps to the deadline
+_PACE_SPIN_S = 0.001 if sys.platform == "win32" else 0.0
+
+# camera.gst_pipeline: auto - MJPEG from the device, decoded by GStreamer, single-slot appsink
+_GST_PIPELINE_TMPL = (
+    "v4l2src device=/dev/video{index} io-mode=2 ! "
+    "image/jpeg,width={width},height={height},framerate={fps}/1 ! jpegdec ! "
+    "videoconvert ! video/x-raw,format=BGR ! appsink max-buffers=1 drop=true sync=false"
+)
+
+# camera.auto_minimize candidates (4:3 first, smallest first)
+_CAMERA_MODES = ((320, 240), (640, 480), (1280, 720))
+
+_MODEL_INT8 = "models/movenet_singlepose_lightning_int8.tflite"
+_MODEL_FLOAT = "models/movenet_singlepose_lightning.tflite"
 
 def make_backend(backend_cfg: dict):
     kind = backend_cfg.get("type", "movenet_tflite")
@@ -40,12 +236,17 @@ def make_backend(backend_cfg: dict):
         print("🧪 Using mock backend (no camera/model load)")
         return MockBackend(sequence_hard_fall())
     elif kind == "movenet_tflite":
-        model_path = backend_cfg.get("model_path", "models/movenet_singlepose_lightning.tflite")
-        threads = int(backend_cfg.get("num_threads", 3))
+        model_path = backend_cfg.get("model_path", _MODEL_INT8)
+        if model_path == _MODEL_INT8 and not os.path.exists(model_path) and os.path.exists(_MODEL_FLOAT):
+            print(f"⚠️ {model_path} not found (run models/download_models.sh); using {_MODEL_FLOAT}")
+            model_path = _MODEL_FLOAT
+        threads = backend_cfg.get("num_threads", "auto")
+        threads = _default_tflite_threads() if threads in (None, "auto") else int(threads)
+        delegate = backend_cfg.get("delegate") or None  # e.g. libedgetpu.so.1 (needs a delegate-compiled model)
         start_load = time.time()
-        print(f"⏳ Loading MoveNet model: {model_path} (threads={threads}) ...")
+        print(f"⏳ Loading MoveNet model: {model_path} (threads={threads}{', delegate=' + delegate if delegate else ''}) ...")
         try:
-            backend = MoveNetSinglePose(model_path, num_threads=threads)
+            backend = MoveNetSinglePose(model_path, num_threads=threads, delegate=delegate)
         except Exception as e:
             print(f"💥 Failed to load MoveNet model: {e}")
             raise
@@ -55,6 +256,18 @@ def make_backend(backend_cfg: dict):
     else:
         raise ValueError(f"Unknown backend type: {kind}")
 
+def _load_dotenv(path: str) -> dict:
+    """KEY=value pairs from a .env file (quotes stripped)."""
+    out = {}
+    with open(path, 'r') as f:
+        for line in f:
+            k, sep, v = line.partition('=')
+            k = k.strip()
+            if not sep or not k or k.startswith('#'):
+                continue
+            out[k] = v.strip().strip('"').strip("'")
+    return out
+
 def make_notifier(cfg: dict):
     # Explicit dummy choice
     if cfg.get("type","telegram") == "dummy":
@@ -77,17 +290,11 @@ def make_notifier(cfg: dict):
     # If still missing, try to parse local .env (when running manually) without extra deps
     if (not token or not chat_id) and os.path.exists('.env'):
         try:
-            with open('.env','r') as f:
-                for line in f:
-                    if '=' not in line or line.strip().startswith('#'):
-                        continue
-                    k,v = line.strip().split('=',1)
-                    k = k.strip()
-                    v = v.strip().strip('"').strip("'")
-                    if not token and k in ("TG_BOT_TOKEN","TELEGRAM_BOT_TOKEN","BOT_TOKEN"):
-                        token = v
-                    if not chat_id and k in ("TG_CHAT_ID","TELEGRAM_CHAT_ID","CHAT_ID"):
-                        chat_id = v
+            env = _load_dotenv('.env')
+            if not token:
+                token = env.get("TG_BOT_TOKEN") or env.get("TELEGRAM_BOT_TOKEN") or env.get("BOT_TOKEN")
+            if not chat_id:
+                chat_id = env.get("TG_CHAT_ID") or env.get("TELEGRAM_CHAT_ID") or env.get("CHAT_ID")
         except Exception as e:
             print(f"⚠️ Could not parse .env for Telegram creds: {e}")
 
@@ -104,65 +311,137 @@ def make_notifier(cfg: dict):
 def run(config_path: str):
     cfg = load_config(config_path)
     # Explicitly log which configuration file is being used and summarize key risk params
+    rcfg = cfg.get("risk", {}) if isinstance(cfg, dict) else {}
+    risk_kwargs = {name: cast(rcfg.get(name, default)) for name, cast, default, _ in _RISK_SCHEMA}
     try:
-        rcfg = cfg.get("risk", {}) if isinstance(cfg, dict) else {}
         print(f"🛠  Loaded config file: {config_path}")
         # Summarize most relevant thresholds that influence fall detection
-        summary_parts = []
-        def _gp(k, default):
-            v = rcfg.get(k, default)
-            summary_parts.append(f"{k}={v}")
-        _gp("angle_threshold_deg", 50.0)
-        _gp("drop_threshold", 0.15)
-        _gp("drop_window_s", 1.0)
-        _gp("immobile_window_s", 10.0)
-        _gp("soft_immobility_s", 30.0)
-        _gp("hard_immobility_s", 60.0)
-        if "fast_fall_immobility_s" in rcfg:
-            _gp("fast_fall_immobility_s", 12.0)
-        if "angle_change_threshold" in rcfg:
-            _gp("angle_change_threshold", 30.0)
-        if "position_change_threshold" in rcfg:
-            _gp("position_change_threshold", 0.15)
-        if "min_kp_confidence" in rcfg:
-            _gp("min_kp_confidence", 0.10)
+        summary_parts = [f"{name}={risk_kwargs[name]}" for name, _, _, show in _RISK_SCHEMA
+                         if show == "always" or (show == "if_set" and name in rcfg)]
         print("🧪 RiskConfig: " + ", ".join(summary_parts))
     except Exception as e:
         print(f"⚠️  Could not summarize risk config: {e}")
+    # Loop/runtime settings parsed once; locals below are read from this
+    S = AppSettings.from_dict(cfg)
+    if S.infer_cpus:
+        # Before the interpreter is built so its worker threads (and "auto" num_threads) follow it;
+        # the camera worker re-pins itself to camera.cpus
+        try:
+            os.sched_setaffinity(0, set(S.infer_cpus))
+            print(f"🧷 Main/inference threads pinned to CPUs {sorted(set(S.infer_cpus))}")
+        except (AttributeError, OSError) as e:
+            print(f"⚠️ Could not set CPU affinity {list(S.infer_cpus)}: {e}")
     backend = make_backend(cfg.get("backend", {}))
+    # Single inference worker: frame N is inferred while frame N-1's result is processed
+    infer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pose-infer")
+    pending_pose = None  # Future for the frame currently being inferred
+    # Near-identical frame skip: reuse the last pose while a coarse frame fingerprint is unchanged
+    motion_skip_eps = S.motion_skip_eps  # mean level change per sampled pixel; 0 = disabled
+    motion_skip_max_age_s = 0.5  # always re-infer at least this often
+    prev_small = None
+    last_pose = None
+    last_fed_ts = None  # ts of the last pose given to the risk engine
+    last_infer_time = 0.0
+    # Temporal skip: run the pose pipeline on every Nth frame only, unless a fall looks possible
+    temporal_skip = S.temporal_skip
+    skip_phase = 0
+    fall_suspect = False
+    # Optional micro-batching: B frames per invoke; poses are then consumed one per loop pass
+    batch_size = S.batch_size if hasattr(backend, "infer_batch") else 1
+    batch_frames, batch_ts = [], []
+    ready_poses = deque()
+    if batch_size > 1:
+        print(f"🧮 Batched inference enabled (batch_size={batch_size})")
     notifier = make_notifier(cfg.get("telegram", {}))
+    # Alert delivery (skeleton render + HTTP) runs here so the frame loop never blocks on the network
+    notify_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="notify")
 
-    camera = cfg.get("camera", {})
-    use_camera = camera.get("enabled", True) and cfg.get("backend",{}).get("type","movenet_tflite") != "mock"
+    use_camera = S.camera_enabled and S.backend_type != "mock"
 
     cap = None
+    camera_worker = None  # background grabber holding the newest frame
+    retired_worker = None  # stopped worker still blocked in grab(); no reopen until it exits
     # Camera operational parameters & retry settings
-    camera_index = int(camera.get("index",0))
-    cam_width    = int(camera.get("width",640))
-    cam_height   = int(camera.get("height",480))
-    cam_req_fps  = int(camera.get("fps",15))
-    retry_interval_s = float(camera.get("retry_interval_s", 5.0))
-    error_notify_interval_s = float(camera.get("error_notify_interval_s", 60.0))
-    reopen_verbose = bool(camera.get("reopen_verbose", True))
+    camera_index = S.camera_index
+    cam_width    = S.cam_width
+    cam_height   = S.cam_height
+    cam_size_checked = True
+    if S.cam_auto_minimize and not S.debug_save_frames and hasattr(backend, "w"):
+        # Smallest common sensor mode that still covers the model input: 320x240 for Lightning's 192x192,
+        # down from the default 640x480 (debug frame saving keeps the configured size)
+        for mw, mh in _CAMERA_MODES:
+            if mw >= backend.w and mh >= backend.h:
+                cam_width, cam_height = mw, mh
+                break
+        cam_size_checked = False  # verify once that the driver accepted it
+    cam_fourcc   = S.cam_fourcc   # empty = driver default
+    cam_req_fps  = S.cam_req_fps
+    cam_verify_fps = S.cam_verify_fps  # re-read the negotiated fps from the driver
+    cam_gst_pipeline = S.cam_gst_pipeline  # "" = V4L2 capture, "auto" = _GST_PIPELINE_TMPL, else custom
+    retry_interval_s = S.retry_interval_s
+    error_notify_interval_s = S.error_notify_interval_s
+    reopen_verbose = S.reopen_verbose
+    release_when_idle = S.release_when_idle  # close the device while PIR-idle / paused
     last_camera_retry = 0.0
     last_camera_error_notify = 0.0
     fps = 15
 
+    cam_api = (cv2.CAP_V4L2 if sys.platform.startswith("linux") else cv2.CAP_ANY) if CV2_AVAILABLE else 0
+
     def _open_camera():
-        nonlocal cap, fps
+        nonlocal cap, fps, camera_worker, cam_size_checked, retired_worker
         if not (use_camera and CV2_AVAILABLE):
             return False
+        if retired_worker is not None:
+            if retired_worker.is_alive():
+                if reopen_verbose:
+                    print("⏳ Previous camera worker still blocked in grab(); not reopening yet")
+                return False
+            retired_worker = None
         try:
-            c = cv2.VideoCapture(camera_index)
-            c.set(cv2.CAP_PROP_FRAME_WIDTH,  cam_width)
-            c.set(cv2.CAP_PROP_FRAME_HEIGHT, cam_height)
-            c.set(cv2.CAP_PROP_FPS, cam_req_fps)
+            c = None
+            if cam_gst_pipeline:
+                # appsink max-buffers=1 drop=true: GStreamer itself keeps only the newest frame
+                pipeline = cam_gst_pipeline if cam_gst_pipeline != "auto" else _GST_PIPELINE_TMPL.format(
+                    index=camera_index, width=cam_width, height=cam_height, fps=cam_req_fps)
+                c = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+                if not c.isOpened():
+                    c.release()
+                    c = None
+                    if reopen_verbose:
+                        print("⚠️ GStreamer camera pipeline failed to open; falling back to V4L2")
+            if c is None:
+                # V4L2 directly on Linux: auto-selection may pick GStreamer, which buffers internally
+                # and ignores CAP_PROP_BUFFERSIZE
+                c = cv2.VideoCapture(camera_index, cam_api)
+                if not c.isOpened() and cam_api != cv2.CAP_ANY:
+                    c.release()
+                    c = cv2.VideoCapture(camera_index)
+                # Keep only the freshest frame queued (before size/fps so the driver negotiates with it)
+                if not c.set(cv2.CAP_PROP_BUFFERSIZE, 1) and reopen_verbose:
+                    print("⚠️  Could not reduce capture buffer (driver ignored CAP_PROP_BUFFERSIZE)")
+                if cam_fourcc:
+                    c.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*cam_fourcc))  # before size/fps
+                    if cam_fourcc == "GREY":
+                        c.set(cv2.CAP_PROP_CONVERT_RGB, 0)  # keep single-channel frames (no BGR expansion)
+                c.set(cv2.CAP_PROP_FRAME_WIDTH,  cam_width)
+                c.set(cv2.CAP_PROP_FRAME_HEIGHT, cam_height)
+                c.set(cv2.CAP_PROP_FPS, cam_req_fps)
             if not c.isOpened():
                 c.release()
                 return False
             cap = c
-            fps_val = c.get(cv2.CAP_PROP_FPS) or cam_req_fps
-            fps = fps_val if fps_val else 15
+            if not cam_size_checked:
+                cam_size_checked = True
+                got = (int(c.get(cv2.CAP_PROP_FRAME_WIDTH)), int(c.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+                if got != (cam_width, cam_height):
+                    print(f"⚠️ Camera ignored auto_minimize size {cam_width}x{cam_height}; delivering {got[0]}x{got[1]}")
+            fps = cam_req_fps or 15
+            if cam_verify_fps:
+                # Opt-in driver round trip; many V4L2 drivers report 0 here
+                fps = c.get(cv2.CAP_PROP_FPS) or fps
+            camera_worker = CameraWorker(c, cpus=S.capture_cpus)
+            camera_worker.start()
             if reopen_verbose:
                 print(f"📷 Camera opened (index={camera_index}, {cam_width}x{cam_height} @ {fps:.1f}fps)")
             return True
@@ -171,6 +450,25 @@ def run(config_path: str):
                 print(f"⚠️ Camera open exception: {e}")
             return False
 
+    def _release_camera():
+        """Stop the worker (it releases the capture itself); a worker stuck in grab() is kept
+        as retired_worker and blocks reopening until it has exited."""
+        nonlocal cap, camera_worker, retired_worker, pending_pose, batch_frames, batch_ts
+        # Frames / poses from before the outage must not reach the risk engine after a reopen
+        pending_pose = None
+        batch_frames, batch_ts = [], []
+        ready_poses.clear()
+        if camera_worker:
+            if not camera_worker.stop():
+                retired_worker = camera_worker
+            camera_worker = None
+        elif cap is not None:
+            try:
+                cap.release()
+            except Exception:
+                pass
+        cap = None
+
     # Initial open attempt
     if use_camera and CV2_AVAILABLE:
         if not _open_camera():
@@ -180,7 +478,7 @@ def run(config_path: str):
             print("⚠️ Camera requested but OpenCV not installed; continuing in mock/no-camera mode")
 
     # PID file lock (prevent multiple instances)
-    pid_file = cfg.get("pid_file", "duruon.pid")
+    pid_file = S.pid_file
     try:
         if os.path.exists(pid_file):
             with open(pid_file, 'r') as pf:
@@ -195,27 +493,11 @@ def run(config_path: str):
     except Exception as e:
         print(f"⚠️ Could not create PID file: {e}")
 
-    risk_cfg = cfg.get("risk", {})
     risk = RiskEngine(fps=int(fps), cfg=RiskConfig(
-        angle_threshold_deg=float(risk_cfg.get("angle_threshold_deg", 50.0)),
-        drop_threshold=float(risk_cfg.get("drop_threshold", 0.15)),
-        drop_window_s=float(risk_cfg.get("drop_window_s", 1.0)),
-        immobile_window_s=float(risk_cfg.get("immobile_window_s", 10.0)),
-        immobile_motion_eps=float(risk_cfg.get("immobile_motion_eps", 0.05)),
-        soft_immobility_s=float(risk_cfg.get("soft_immobility_s", 30.0)),
-        hard_immobility_s=float(risk_cfg.get("hard_immobility_s", 60.0)),
-    fast_fall_immobility_s=float(risk_cfg.get("fast_fall_immobility_s", 12.0)),
-        cooldown_s=float(risk_cfg.get("cooldown_s", 600.0)),
-        confirm_grace_s=float(risk_cfg.get("confirm_grace_s", 6.0)),
-        movement_tolerance_low_angle=float(risk_cfg.get("movement_tolerance_low_angle", 0.12)),
-        movement_tolerance_high_angle=float(risk_cfg.get("movement_tolerance_high_angle", 0.05)),
-        shower_mode_enabled=bool(risk_cfg.get("shower_mode_enabled", True)),
-        shower_start_hour=int(risk_cfg.get("shower_start_hour", 6)),
-        shower_end_hour=int(risk_cfg.get("shower_end_hour", 22)),
-        shower_duration_multiplier=float(risk_cfg.get("shower_duration_multiplier", 4.0)),
-        angle_change_threshold=float(risk_cfg.get("angle_change_threshold", 30.0)),
-        position_change_threshold=float(risk_cfg.get("position_change_threshold", 0.15)),
-    min_kp_confidence=float(risk_cfg.get("min_kp_confidence", 0.10)),
+        **risk_kwargs,
+        # Size the history ring once for the longest window so it never grows
+        ring_capacity=int(max(5.0, risk_kwargs["hard_immobility_s"], risk_kwargs["soft_immobility_s"],
+                              risk_kwargs["immobile_window_s"]) + 5) * max(1, int(fps)),
     ))
 
     led_system = None
@@ -258,71 +540,95 @@ def run(config_path: str):
         print("⚠️  PIR activation not available - running in continuous mode")
 
     # Alert / heartbeat configuration
-    alert_cfg = cfg.get("alerting", {})
-    heartbeat_cfg = alert_cfg.get("heartbeat", {}) if isinstance(alert_cfg.get("heartbeat"), dict) else {}
-    heartbeat_enabled = bool(heartbeat_cfg.get("enabled", False))
-    heartbeat_interval = float(heartbeat_cfg.get("interval_s", 86400.0))
+    heartbeat_enabled = S.heartbeat_enabled
+    heartbeat_interval = S.heartbeat_interval
     last_heartbeat = time.time()
     start_time = last_heartbeat
+    last_activity_time = start_time  # last alert sent; a heartbeat after it would be redundant
     event_count = 0
 
     monitoring_active = pir_system is None
     frame_count = 0
     last_debug = 0
-    # Telegram callback polling setup (for ACK / stop buttons)
-    last_callback_poll = 0.0
-    callback_poll_interval = 1.0  # seconds
+    # Telegram callback polling (ACK / stop buttons, commands) runs on _callback_poller
+    callback_poll_interval = 1.0  # seconds; floor between polls for notifiers without long polling
+    cb_queue = queue.SimpleQueue()
     remote_paused = False  # Telegram command-based pause state
     # Throttle repetitive presence combination logs
-    last_presence_combo = None  # ('present','pir_motion') tuple
+    last_presence_combo = -1  # _COMBO_* code (camera person bit 1, PIR motion bit 0); -1 = none yet
     last_presence_log_time = 0.0
     presence_log_interval = 10.0  # seconds
     first_presence_cycle = True
 
     # Logging frequency (lower debug frequency)
-    logging_cfg = cfg.get("logging", {}) if isinstance(cfg.get("logging"), dict) else {}
-    active_debug_interval = float(logging_cfg.get("active_debug_interval_s", 30.0))  # was 5
-    idle_debug_interval = float(logging_cfg.get("idle_debug_interval_s", 120.0))     # was 30
+    active_debug_interval = S.active_debug_interval
+    idle_debug_interval = S.idle_debug_interval
+    # Status lines are skipped entirely (no formatting) when disabled
+    status_debug = S.status_debug
+    # DuruOn.Main and DuruOn.Risk share one stdout handler; per-frame DEBUG lines are rate-limited
+    # to 1/s per message. Other DuruOn.* loggers (LED, PIR) keep their default (no output).
+    _log_handler = logging.StreamHandler(sys.stdout)
+    _log_handler.setFormatter(logging.Formatter("%(message)s"))
+    _log_handler.addFilter(_RepeatFilter(1.0))
+    for _name in ('DuruOn.Main', 'DuruOn.Risk'):
+        _lg = logging.getLogger(_name)
+        if not _lg.handlers:
+            _lg.addHandler(_log_handler)
+            _lg.propagate = False
+        _lg.setLevel(logging.DEBUG if status_debug else logging.INFO)
     # Presence log debounce settings
-    presence_min_persist_s = float(logging_cfg.get("presence_min_persist_s", 2.0))
-    min_log_gap_s = float(logging_cfg.get("presence_min_log_gap_s", 1.5))
+    presence_min_persist_s = S.presence_min_persist_s
+    min_log_gap_s = S.min_log_gap_s
     last_presence_log_real = 0.0
-    pending_combo = None
+    pending_combo = -1
     pending_combo_since = 0.0
 
     # Debug frame capture configuration
-    debug_cfg = cfg.get("debug", {}) if isinstance(cfg.get("debug"), dict) else {}
-    debug_save_frames = bool(debug_cfg.get("save_frames", False)) and CV2_AVAILABLE and use_camera
-    debug_frame_dir = debug_cfg.get("frame_dir", "debug_frames")
-    debug_save_interval = float(debug_cfg.get("save_interval_s", 10.0))
-    debug_save_on_state_change = bool(debug_cfg.get("save_on_state_change", True))
-    debug_max_frames = int(debug_cfg.get("max_frames", 200))
-    debug_brightness_warn_interval = float(debug_cfg.get("brightness_warn_interval_s", 60.0))
-    risk_verbose = bool(debug_cfg.get("risk_verbose", False))
-    risk_verbose_interval = float(debug_cfg.get("risk_verbose_interval_s", 5.0))
-    risk_snapshot_interval = float(debug_cfg.get("risk_snapshot_every_s", 0.0))  # 0 = disabled
-    keypoint_dump = bool(debug_cfg.get("keypoint_dump", True))
-    keypoint_dump_top_n = int(debug_cfg.get("keypoint_dump_top_n", 6))  # show weakest N keypoints
-    risk_verbose_compact = bool(debug_cfg.get("risk_verbose_compact", True))
+    debug_save_frames = S.debug_save_frames and CV2_AVAILABLE and use_camera
+    debug_frame_dir = S.debug_frame_dir
+    debug_save_interval = S.debug_save_interval
+    debug_save_on_state_change = S.debug_save_on_state_change
+    debug_max_frames = S.debug_max_frames
+    debug_brightness_warn_interval = S.debug_brightness_warn_interval
+    risk_verbose = S.risk_verbose
+    risk_verbose_interval = S.risk_verbose_interval
+    risk_snapshot_interval = S.risk_snapshot_interval  # 0 = disabled
+    keypoint_dump = S.keypoint_dump
+    keypoint_dump_top_n = S.keypoint_dump_top_n  # show weakest N keypoints
+    risk_verbose_compact = S.risk_verbose_compact
     last_debug_frame_save = 0.0
     last_brightness_warn = 0.0
+    last_brightness_check = 0.0
     saved_frame_count = 0
     last_saved_state_combo = None
     last_risk_verbose = 0.0
     last_risk_snapshot = 0.0
+    snapshot_q = None
+    if risk_verbose and risk_snapshot_interval > 0:
+        snapshot_q = queue.Queue(maxsize=1)  # single slot: a slow upload only ever leaves the newest pose waiting
+        threading.Thread(target=_debug_snapshot_worker, args=(snapshot_q, notifier), daemon=True,
+                         name="debug-snapshot").start()
 
     # Presence smoothing: tolerate brief pose loss before clearing presence
-    presence_grace_frames = int(debug_cfg.get("presence_grace_frames", 5))  # consecutive missing frames tolerated
+    presence_grace_frames = S.presence_grace_frames  # consecutive missing frames tolerated
     missing_frames = 0
     smoothed_present = False
+    debug_frame_q = None
     if debug_save_frames:
         try:
             os.makedirs(debug_frame_dir, exist_ok=True)
             print(f"🧪 Debug frame saving enabled -> {debug_frame_dir}/ (interval={debug_save_interval}s, on_state_change={debug_save_on_state_change})")
+            # JPEG encode + disk write happen on a writer thread; frames are dropped if it falls behind
+            debug_frame_q = queue.Queue(maxsize=4)
+            threading.Thread(target=_debug_frame_writer, args=(debug_frame_q,), daemon=True,
+                             name="debug-frame-writer").start()
         except Exception as e:
             print(f"⚠️ Could not create debug frame directory {debug_frame_dir}: {e}")
             debug_save_frames = False
 
+    # Set by PIR callbacks and signal handlers so the main loop reacts without waiting out its sleep
+    wake = threading.Event()
+
     def on_pir_activate():
         nonlocal monitoring_active
         monitoring_active = True
@@ -330,6 +636,7 @@ def run(config_path: str):
         if led_system:
             led_system.set_pir_status("triggered")
             led_system.set_system_status("active")
+        wake.set()
 
     def on_pir_deactivate():
         nonlocal monitoring_active
@@ -338,6 +645,7 @@ def run(config_path: str):
         if led_system:
             led_system.set_pir_status("clear")
             led_system.set_system_status("idle")
+        wake.set()
 
     if pir_system:
         pir_system.set_activation_callback(on_pir_activate)
@@ -348,11 +656,15 @@ def run(config_path: str):
     def handle_sig(*_):
         nonlocal running
         running = False
+        wake.set()
     for s in (signal.SIGINT, signal.SIGTERM):
         signal.signal(s, handle_sig)
 
+    threading.Thread(target=_callback_poller, args=(notifier, cb_queue, wake, callback_poll_interval),
+                     daemon=True, name="telegram-poller").start()
+
     # Startup summary (include git revision if available)
-    backend_type = cfg.get("backend", {}).get("type", "unknown")
+    backend_type = S.backend_type
     notifier_type = type(notifier).__name__
     camera_status = (
         f"enabled idx={camera_index} {cam_width}x{cam_height}@{cam_req_fps}fps" if (use_camera and CV2_AVAILABLE) else (
@@ -380,322 +692,427 @@ def run(config_path: str):
         if led_system:
             led_system.set_system_status("active")
 
+    # Loop-invariant aliases: plain locals instead of global/attribute lookups every frame
+    _time = time.time
+    _monotonic = time.monotonic
+    _clock = time.perf_counter
+    # Per-frame calls on objects fixed for the process lifetime, bound once
+    _infer = backend.infer
+    _submit_infer = infer_executor.submit
+    _risk_update = risk.update
+    _led_alert = led_system.set_alert_status if led_system else None
+    camera_live = use_camera and CV2_AVAILABLE
+    next_tick = _clock()  # pacing deadline; processing time is absorbed instead of added
+
+    def _pace(period: float):
+        """Sleep until the next loop deadline; PIR callbacks / signals cut the wait short."""
+        nonlocal next_tick
+        next_tick += period
+        sleep_time = next_tick - _clock()
+        if sleep_time > 0:
+            if wake.wait(sleep_time - _PACE_SPIN_S):
+                wake.clear()
+                next_tick = _clock()  # woken early (PIR / signal); restart cadence from now
+                return
+            while _clock() < next_tick:
+                time.sleep(0)
+        elif sleep_time < -period:
+            next_tick = _clock()  # missed by more than a period; resync instead of bursting
+
+    # Telegram callback / command results (main thread); button and /command variants share a handler.
+    # Replies go through notify_executor like every other message, so no HTTP on the frame loop
+    def _cb_stop():
+        nonlocal running
+        notify_executor.submit(notifier.send_text, "🛑 애플리케이션이 사용자 요청(앱중지)으로 종료됩니다.")
+        running = False
+
+    def _cb_pause():
+        nonlocal remote_paused
+        if not remote_paused:
+            remote_paused = True
+            if led_system:
+                led_system.set_system_status('idle')
+                led_system.set_pir_status('clear')
+            notify_executor.submit(notifier.send_text, "⏸️ 모니터링이 일시중지되었습니다. (/resume 또는 재개 버튼)")
+
+    def _cb_resume():
+        nonlocal remote_paused
+        if remote_paused:
+            remote_paused = False
+            if led_system:
+                led_system.set_system_status('active' if monitoring_active else 'idle')
+            notify_executor.submit(notifier.send_text, "▶️ 모니터링이 재개되었습니다.")
+
+    def _cb_status():
+        cam_ok = (cap and cap.isOpened()) if cap else False
+        pir_state = pir_system.is_monitoring if pir_system else False
+        notify_executor.submit(notifier.send_text,
+            f"ℹ️ 상태:\n활성={monitoring_active and not remote_paused} (pause={remote_paused})\n카메라={'정상' if cam_ok else '중단'} PIR={'활성' if pir_state else '대기'}\n프레임={frame_count} 이벤트={event_count}")
+
+    cb_handlers = {
+        'STOP_APP': _cb_stop,
+        'PAUSE_MON': _cb_pause, 'CMD_PAUSE': _cb_pause,
+        'RESUME_MON': _cb_resume, 'CMD_RESUME': _cb_resume,
+        'CMD_STATUS': _cb_status,
+    }
+
+    def _poll_callbacks():
+        """Handle Telegram results queued by _callback_poller (never blocks)."""
+        while True:
+            try:
+                cb_res = cb_queue.get_nowait()
+            except queue.Empty:
+                return
+            handler = cb_handlers.get(cb_res)  # ACK_OK / ACK_FALSE are answered by the notifier itself
+            if handler:
+                try:
+                    handler()
+                except Exception:
+                    pass
+
     try:
         while running:
-            current_time = time.time()
-            if use_camera and CV2_AVAILABLE:
+            current_time = _time()
+            if not (monitoring_active and not remote_paused):
+                # Idle fast path: the camera worker keeps draining frames without decoding;
+                # no camera reads, inference, PIR sampling or risk updates until activation / resume
+                pending_pose = None  # discard in-flight pose from before going idle
+                last_pose = None
+                batch_frames, batch_ts = [], []
+                ready_poses.clear()
+                if release_when_idle and cap is not None:
+                    # No capture, decode or USB streaming while idle; reopened on the first active pass
+                    _release_camera()
+                    last_camera_retry = 0.0
+                    if reopen_verbose:
+                        print("📷 Camera released while idle")
+                elif camera_worker:
+                    camera_worker.want_decode = False
+                if current_time - last_debug >= idle_debug_interval and log.isEnabledFor(logging.DEBUG):
+                    log.debug("💤 IDLE: frames=%d, PIR monitoring=%s", frame_count,
+                              pir_system.is_monitoring if pir_system else False)
+                    last_debug = current_time
+                # Block until PIR activation, a signal or a Telegram command sets wake; the timeout
+                # only bounds how late the next idle debug line can be
+                idle_wait = (last_debug + idle_debug_interval - current_time) if log.isEnabledFor(logging.DEBUG) else idle_debug_interval
+                if wake.wait(max(idle_wait, 0.0)):
+                    wake.clear()
+                _poll_callbacks()
+                continue
+            if temporal_skip > 1 and batch_size == 1 and not fall_suspect:
+                skip_phase = (skip_phase + 1) % temporal_skip
+                if skip_phase:
+                    # Skipped frame: risk windows are time-based, so nothing is fed in for it.
+                    # Consume it from the worker (read() only returns newer frames) so the next
+                    # pass waits for the following one instead of picking this one up.
+                    if camera_worker is not None:
+                        camera_worker.read(timeout=2.0)
+                    else:
+                        _pace(1.0/fps if camera_live else 0.1)
+                    _poll_callbacks()
+                    continue
+            else:
+                skip_phase = 0
+            if camera_live:
                 # Ensure camera open / retry
                 if (cap is None or not cap.isOpened()):
-                    now = time.time()
-                    if now - last_camera_retry >= retry_interval_s:
-                        last_camera_retry = now
+                    if current_time - last_camera_retry >= retry_interval_s:
+                        last_camera_retry = current_time
                         opened = _open_camera()
                         if not opened and reopen_verbose:
                             print(f"⏳ Camera reopen attempt failed; next in {retry_interval_s:.1f}s")
                     frame = None
                     # If camera not yet available, idle briefly
                     if cap is None or not cap.isOpened():
-                        time.sleep(0.2)
+                        wake.wait(0.2)
+                        wake.clear()
                         continue
-                ok, frame = cap.read()
+                # Worker thread keeps the driver queue drained; decode only while active
+                camera_worker.want_decode = True
+                ok, frame = camera_worker.read(timeout=2.0)
                 if not ok:
                     # Release and schedule retry
                     if reopen_verbose:
                         print("⚠️ Camera frame read failed; releasing and scheduling reopen")
-                    try:
-                        cap.release()
-                    except Exception:
-                        pass
-                    cap = None
-                    now = time.time()
+                    _release_camera()
+                    now = _time()
                     if monitoring_active and (now - last_camera_error_notify) >= error_notify_interval_s:
                         # Localized camera error notice
-                        notifier.send_text("⚠️ 카메라에서 프레임을 읽지 못했습니다. 재연결을 계속 시도합니다.")
+                        notify_executor.submit(notifier.send_text, "⚠️ 카메라에서 프레임을 읽지 못했습니다. 재연결을 계속 시도합니다.")
                         last_camera_error_notify = now
                     if led_system:
                         led_system.set_system_status("error")
-                    time.sleep(0.5)
+                    wake.wait(0.5)
+                    wake.clear()
                     continue
+                # read() blocked until this frame arrived: re-sample once so it carries its own time
+                current_time = _time()
             else:
                 frame = None
 
-            if monitoring_active and not remote_paused:
-                # Optional brightness / debug frame saving BEFORE inference
-                if use_camera and CV2_AVAILABLE and frame is not None:
-                    try:
-                        mean_val = float(frame.mean())
-                        now_bt = time.time()
-                        if mean_val < 30 and (now_bt - last_brightness_warn) >= debug_brightness_warn_interval:
+            # 1/16-strided luma proxy (green plane, or the frame itself when GREY), shared by the
+            # brightness probe and the unchanged-frame gate; a view, so no pixel pass until read
+            gray_small = None
+            if frame is not None:
+                gray_small = frame[::16, ::16, 1] if frame.ndim == 3 else frame[::16, ::16]
+            # Optional brightness / debug frame saving BEFORE inference
+            if camera_live and frame is not None:
+                try:
+                    now_bt = current_time
+                    # Light level changes slowly: probe a 1/16-strided sample at most once per second
+                    if (now_bt - last_brightness_check) >= 1.0 and (now_bt - last_brightness_warn) >= debug_brightness_warn_interval:
+                        last_brightness_check = now_bt
+                        mean_val = float(gray_small.mean())
+                        if mean_val < 30:
                             level = "extremely dark" if mean_val < 10 else "dark"
                             print(f"🌑 LOW LIGHT: mean_pixel={mean_val:.1f} ({level}) -> detection quality may drop")
                             last_brightness_warn = now_bt
-                        # Save diagnostic frame if enabled
-                        if debug_save_frames:
-                            combo_state = (last_presence_combo or (False, False))
-                            save_reason = None
-                            if (time.time() - last_debug_frame_save) >= debug_save_interval:
-                                save_reason = "interval"
-                            if debug_save_on_state_change and combo_state != last_saved_state_combo:
-                                save_reason = (save_reason + "+state" if save_reason else "state_change")
-                            if save_reason and saved_frame_count < debug_max_frames:
-                                ts_name = time.strftime('%Y%m%d_%H%M%S')
-                                fname = os.path.join(debug_frame_dir, f"frame_{ts_name}_{save_reason}_{saved_frame_count:04d}.jpg")
-                                try:
-                                    cv2.imwrite(fname, frame)
-                                    print(f"🖼️ Saved debug frame ({save_reason}) -> {fname}")
-                                    last_debug_frame_save = time.time()
-                                    last_saved_state_combo = combo_state
-                                    saved_frame_count += 1
-                                except Exception as e:
-                                    print(f"⚠️ Failed saving debug frame: {e}")
-                                if saved_frame_count >= debug_max_frames:
-                                    print("🧪 Reached debug_max_frames limit; disabling further saves")
-                                    debug_save_frames = False
-                    except Exception as e:
-                        pass
-                try:
-                    pose = backend.infer(frame)
+                    # Save diagnostic frame if enabled
+                    if debug_save_frames:
+                        combo_state = max(last_presence_combo, _COMBO_CLEAR)
+                        save_reason = None
+                        if (current_time - last_debug_frame_save) >= debug_save_interval:
+                            save_reason = "interval"
+                        if debug_save_on_state_change and combo_state != last_saved_state_combo:
+                            save_reason = (save_reason + "+state" if save_reason else "state_change")
+                        if save_reason and saved_frame_count < debug_max_frames:
+                            ts_name = time.strftime('%Y%m%d_%H%M%S', time.localtime(current_time))
+                            fname = os.path.join(debug_frame_dir, f"frame_{ts_name}_{save_reason}_{saved_frame_count:04d}.jpg")
+                            try:
+                                # Each retrieve() returns a new array, so the frame can be queued without a copy
+                                debug_frame_q.put_nowait((fname, frame))
+                                last_debug_frame_save = current_time
+                                last_saved_state_combo = combo_state
+                                saved_frame_count += 1
+                            except queue.Full:
+                                pass  # writer busy; try again on the next eligible frame
+                            if saved_frame_count >= debug_max_frames:
+                                print("🧪 Reached debug_max_frames limit; disabling further saves")
+                                debug_save_frames = False
                 except Exception as e:
-                    print(f"⚠️ backend.infer error: {e}; skipping frame")
-                    time.sleep(0.05)
-                    continue
-                metrics = risk.update(pose)
-                frame_count += 1
-                raw_present = metrics.get("present")
-                # Update smoothed presence with grace for intermittent keypoint loss
-                if raw_present:
-                    missing_frames = 0  # reset counter
-                    if not smoothed_present:
-                        smoothed_present = True
+                    pass
+            skip_infer = False
+            if motion_skip_eps > 0 and batch_size == 1 and frame is not None and last_pose is not None:
+                # Mean per-pixel L1 difference of gray_small vs the last inferred frame
+                small = gray_small.astype(np.int16)
+                skip_infer = (
+                    prev_small is not None
+                    and prev_small.shape == small.shape
+                    and float(np.abs(small - prev_small).mean()) < motion_skip_eps
+                    and (current_time - last_infer_time) < motion_skip_max_age_s
+                )
+                if not skip_infer:
+                    prev_small = small
+            try:
+                if skip_infer:
+                    # Scene unchanged: take a finished in-flight pose if any, else repeat the last one
+                    if pending_pose is not None and pending_pose.done():
+                        pose = pending_pose.result()
+                        pending_pose = None
+                    else:
+                        pose = last_pose
+                elif batch_size > 1:
+                    # Pipeline per batch: submit B frames together, hand out the previous batch's poses in order
+                    batch_frames.append(frame)
+                    batch_ts.append(current_time)
+                    # Full batch, or a partial one (padded to batch_size) once its oldest frame has waited
+                    # two batch periods on a slow camera. Checked as frames arrive; a stalled camera ends in
+                    # the read-failure path, whose _release_camera() drops the unfinished batch.
+                    if len(batch_frames) >= batch_size or current_time - batch_ts[0] >= 2.0 * batch_size / fps:
+                        prev_batch = pending_pose
+                        pending_pose = _submit_infer(_infer_padded, backend.infer_batch, batch_frames, batch_ts, batch_size)
+                        batch_frames, batch_ts = [], []
+                        last_infer_time = current_time
+                        if prev_batch is not None:
+                            ready_poses.extend(prev_batch.result())
+                    if not ready_poses:
+                        continue  # batch still filling / in flight
+                    pose = ready_poses.popleft()
                 else:
-                    missing_frames += 1
-                    if missing_frames >= presence_grace_frames:
-                        if smoothed_present:
-                            smoothed_present = False
-                present = smoothed_present
-                pir_motion = pir_system._read_pir() if pir_system else False
-
-                # Risk debug instrumentation
-                if risk_verbose:
-                    now_rv = time.time()
-                    if (now_rv - last_risk_verbose) >= risk_verbose_interval:
-                        # Optional keypoint dump when absent or low score
-                        kp_extra = ""
-                        if keypoint_dump:
-                            try:
+                    # Pipeline: submit this frame, then consume the previous frame's pose
+                    prev_pose = pending_pose
+                    pending_pose = _submit_infer(_infer, frame)
+                    last_infer_time = current_time
+                    if prev_pose is None:
+                        continue  # pipeline warming up
+                    pose = prev_pose.result()
+                last_pose = pose
+            except Exception as e:
+                print(f"⚠️ backend.infer error: {e}; skipping frame")
+                wake.wait(0.05)
+                wake.clear()
+                continue
+            if pose.ts == last_fed_ts:
+                # Reused pose (scene unchanged): not a new sample - a repeat would add a zero-motion
+                # entry to the time-based immobility window
+                _poll_callbacks()
+                continue
+            last_fed_ts = pose.ts
+            metrics = _risk_update(pose)
+            frame_count += 1
+            raw_present = metrics.present
+            event = metrics.event
+            # Full frame rate while a drop / low torso angle / pending fall is in play
+            fall_suspect = bool(
+                metrics.sudden_drop
+                or (raw_present and metrics.torso_angle <= risk.cfg.angle_threshold_deg + 15.0)
+                or risk.pending_fall_ts is not None
+            )
+            # Update smoothed presence with grace for intermittent keypoint loss
+            if raw_present:
+                missing_frames = 0
+                smoothed_present = True
+            else:
+                missing_frames += 1
+                if missing_frames >= presence_grace_frames:
+                    smoothed_present = False
+            present = smoothed_present
+            # Level latched by the PIR thread (edge callback / its own poll) - no GPIO access here
+            pir_motion = pir_system.motion_state if pir_system else False
+
+            # Risk debug instrumentation
+            if risk_verbose:
+                now_rv = current_time
+                if (now_rv - last_risk_verbose) >= risk_verbose_interval:
+                    # Optional keypoint dump when absent or low score
+                    kp_extra = ""
+                    if keypoint_dump:
+                        try:
+                            arr = pose.kps_array
+                            if arr is not None:
+                                # Weakest N straight from the raw score column (argpartition, then order those N),
+                                # limited to joints that survived the backend's confidence filter
+                                kept = np.flatnonzero([name in pose.keypoints for name in COCO17])
+                                scores = arr[kept, 2]
+                                n = min(keypoint_dump_top_n, len(scores))
+                                idx = np.argpartition(scores, n - 1)[:n] if n > 0 else np.empty(0, dtype=int)
+                                idx = idx[np.argsort(scores[idx])]
+                                weakest_str = ",".join([f"{COCO17[kept[i]]}:{scores[i]:.2f}" for i in idx])
+                            else:
                                 # Sort by confidence ascending
                                 kps = sorted(pose.keypoints.items(), key=lambda kv: kv[1][2])
                                 weakest = kps[:keypoint_dump_top_n]
                                 weakest_str = ",".join([f"{n}:{v[2]:.2f}" for n,v in weakest])
-                                # Show hips/shoulders explicitly if missing
-                                req = []
-                                for rq in ("left_hip","right_hip","left_shoulder","right_shoulder"):
-                                    if rq in pose.keypoints:
-                                        req.append(f"{rq}:{pose.keypoints[rq][2]:.2f}")
-                                kp_extra = f" | kp[{len(pose.keypoints)}] mean={pose.score:.2f} weak={weakest_str} req={' '.join(req)}"
-                            except Exception:
-                                pass
-                        if risk_verbose_compact:
-                            # Compact form with key motion deltas (vertical dy & total angle change) + fallback flag
-                            print(
-                                "🧪 RISK DBG: pres=%s raw=%s evt=%s ang=%.0f° drop=%s imm=%s dy=%.3f dAngT=%.1f pos=%.3f cmp[d:%s a:%s p:%s] miss=%d/%d fb=%s sc=%.2f%s" % (
-                                    present, raw_present, metrics.get('event'), metrics.get('torso_angle', -1.0),
-                                    metrics.get('sudden_drop'), metrics.get('immobile'), metrics.get('vertical_dy', 0.0), metrics.get('angle_change_total', 0.0), metrics.get('position_change_total',0.0),
-                                    metrics.get('drop_component_dy'), metrics.get('drop_component_angle'), metrics.get('drop_component_pos'),
-                                    missing_frames, presence_grace_frames, metrics.get('fallback_used'), pose.score, kp_extra
-                                )
-                            )
-                        else:
-                            print(
-                                "🧪 RISK DBG: present=%s event=%s angle=%.1f sudden_drop=%s dy=%.3f angleΔ=%.1f totalAngleΔ=%.1f motion_eps=%.3f immobile=%s softT=%.1fs hardT=%.1fs vx=%.3f vy=%.3f score=%.2f%s" % (
-                                    metrics.get('present'), metrics.get('event'), metrics.get('torso_angle', -1.0),
-                                    metrics.get('sudden_drop'), metrics.get('vertical_dy', 0.0), metrics.get('angle_change',0.0), metrics.get('angle_change_total',0.0),
-                                    metrics.get('adaptive_motion_eps',0.0), metrics.get('immobile'),
-                                    metrics.get('adaptive_soft_threshold',0.0), metrics.get('adaptive_hard_threshold',0.0),
-                                    metrics.get('debug_vx',0.0), metrics.get('debug_vy',0.0), pose.score, kp_extra
-                                )
-                            )
-                        last_risk_verbose = now_rv
-                    # Optional periodic anonymized snapshot even without event to verify pose skeleton
-                    if risk_snapshot_interval > 0 and metrics.get('present'):
-                        now_rs = time.time()
-                        if (now_rs - last_risk_snapshot) >= risk_snapshot_interval:
-                            try:
-                                img_dbg = render_skeleton_image(pose)
-                                notifier.send_photo(img_dbg, caption="🧪 Debug pose snapshot")
-                                last_risk_snapshot = now_rs
-                            except Exception as e:
-                                print(f"⚠️ Debug snapshot failed: {e}")
+                            # Show hips/shoulders explicitly if missing
+                            req = []
+                            for rq in ("left_hip","right_hip","left_shoulder","right_shoulder"):
+                                if rq in pose.keypoints:
+                                    req.append(f"{rq}:{pose.keypoints[rq][2]:.2f}")
+                            kp_extra = f" | kp[{len(pose.keypoints)}] mean={pose.score:.2f} weak={weakest_str} req={' '.join(req)}"
+                        except Exception:
+                            pass
+                    # Compact form: key motion deltas (vertical dy & total angle change) + fallback flag
+                    print((_RISK_DBG_COMPACT if risk_verbose_compact else _RISK_DBG_FULL).format(
+                        m=metrics, present=present, miss=missing_frames, grace=presence_grace_frames,
+                        score=pose.score, extra=kp_extra))
+                    last_risk_verbose = now_rv
+                # Optional periodic anonymized snapshot even without event to verify pose skeleton
+                if snapshot_q is not None and raw_present:
+                    now_rs = current_time
+                    if (now_rs - last_risk_snapshot) >= risk_snapshot_interval:
+                        # Newest wins: replace a snapshot the worker has not picked up yet
+                        try:
+                            snapshot_q.get_nowait()
+                        except queue.Empty:
+                            pass
+                        try:
+                            snapshot_q.put_nowait(pose)
+                        except queue.Full:
+                            pass
+                        last_risk_snapshot = now_rs
+            if pir_system:
+                # 2-bit combo: camera person (2) | PIR motion (1)
+                combo = (2 if present else 0) | (1 if pir_motion else 0)
+                now_ts = current_time
+                periodic = (now_ts - last_presence_log_time) >= presence_log_interval
+                suppress = first_presence_cycle and combo == _COMBO_CLEAR
+                # Debounce logic: wait for stability before accepting new combo (dual detection bypasses it)
+                if combo != last_presence_combo:
+                    if pending_combo != combo:
+                        pending_combo = combo
+                        pending_combo_since = now_ts
+                    stable = combo == _COMBO_DUAL or (now_ts - pending_combo_since) >= presence_min_persist_s
+                    if stable:
+                        # Enforce minimum gap between any presence logs
+                        if (now_ts - last_presence_log_real) >= min_log_gap_s:
+                            if not suppress:
+                                print(_COMBO_MSG[combo])
+                            last_presence_combo = combo
+                            last_presence_log_real = now_ts
+                            last_presence_log_time = now_ts
+                            if combo == _COMBO_DUAL:
+                                pir_system.update_motion()
+                                if led_system:
+                                    led_system.set_pir_status("monitoring")
+                elif periodic and (now_ts - last_presence_log_real) >= min_log_gap_s:
+                    # Periodic heartbeat of presence state
+                    shown = max(last_presence_combo, _COMBO_CLEAR)  # none yet -> reported as clear
+                    if not (suppress and shown == _COMBO_CLEAR):
+                        print(_COMBO_MSG_PERIODIC[shown])
+                    last_presence_log_time = now_ts
+                    last_presence_log_real = now_ts
+                first_presence_cycle = False
+            if current_time - last_debug >= active_debug_interval and log.isEnabledFor(logging.DEBUG):
+                if raw_present:
+                    log.debug("🔍 ACTIVE: frames=%d, present=%s, event=%s, torso_angle=%.1f°, vx=%.3f, vy=%.3f",
+                              frame_count, raw_present, event, metrics.torso_angle,
+                              metrics.debug_vx, metrics.debug_vy)
+                else:
+                    log.debug("🔍 ACTIVE: frames=%d, present=%s, event=%s, no person detected", frame_count, raw_present, event)
                 if pir_system:
-                    combo = (bool(present), bool(pir_motion))  # (present, pir_motion)
-                    now_ts = time.time()
-                    periodic = (now_ts - last_presence_log_time) >= presence_log_interval
-                    suppress = first_presence_cycle and combo == (False, False)
-                    # Debounce logic: wait for stability before accepting new combo
-                    if combo != last_presence_combo:
-                        if pending_combo != combo:
-                            pending_combo = combo
-                            pending_combo_since = now_ts
-                        stable = (now_ts - pending_combo_since) >= presence_min_persist_s
-                        # Dual detection considered important -> bypass stability delay
-                        if combo == (True, True):
-                            stable = True
-                        if stable:
-                            # Enforce minimum gap between any presence logs
-                            if (now_ts - last_presence_log_real) >= min_log_gap_s:
-                                if combo == (True, True):
-                                    print("✅ DUAL DETECTION: Camera + PIR both detect presence (timer reset)")
-                                elif combo == (True, False):
-                                    print("📷 CAMERA ONLY: person detected; PIR clear (countdown continues)")
-                                elif combo == (False, True):
-                                    print("📡 PIR ONLY: motion detected; no person in camera (countdown continues)")
-                                elif not suppress:
-                                    print("👻 BOTH CLEAR: no person & PIR clear (idle countdown)")
-                                last_presence_combo = combo
-                                last_presence_log_real = now_ts
-                                last_presence_log_time = now_ts
-                                if combo == (True, True):
-                                    pir_system.update_motion()
-                                    if led_system:
-                                        led_system.set_pir_status("monitoring")
-                    elif periodic and (now_ts - last_presence_log_real) >= min_log_gap_s:
-                        # Periodic heartbeat of presence state
-                        if last_presence_combo == (True, True):
-                            print("✅ DUAL DETECTION: (periodic)")
-                        elif last_presence_combo == (True, False):
-                            print("📷 CAMERA ONLY: (periodic) still person detected")
-                        elif last_presence_combo == (False, True):
-                            print("📡 PIR ONLY: (periodic) still motion only")
-                        elif not suppress:
-                            print("👻 BOTH CLEAR: (periodic) still idle")
-                        last_presence_log_time = now_ts
-                        last_presence_log_real = now_ts
-                    first_presence_cycle = False
-                if current_time - last_debug >= active_debug_interval:
-                    present = metrics.get("present")
-                    event = metrics.get("event") 
-                    if present:
-                        torso_angle = metrics.get('torso_angle', 'N/A')
-                        vx = metrics.get('debug_vx', 0)
-                        vy = metrics.get('debug_vy', 0)
-                        print(f"🔍 ACTIVE: frames={frame_count}, present={present}, event={event}, torso_angle={torso_angle:.1f}°, vx={vx:.3f}, vy={vy:.3f}")
-                    else:
-                        print(f"🔍 ACTIVE: frames={frame_count}, present={present}, event={event}, no person detected")
-                    if pir_system:
-                        time_since_motion = current_time - pir_system.last_motion_time if pir_system.last_motion_time else 0
-                        print(f"📡 PIR DEBUG: monitoring={pir_system.is_monitoring}, last_motion={time_since_motion:.1f}s ago, timeout={pir_system.auto_sleep_timeout}s")
-                        if time_since_motion > pir_system.auto_sleep_timeout:
-                            print("⚠️  PIR SHOULD DEACTIVATE BUT HASN'T!")
-                    last_debug = current_time
-                if metrics.get("present"):
-                    event = metrics.get("event")
-                    if event:
-                        event_count += 1
-                        if led_system:
-                            if "hard" in event or "fall" in event:
-                                led_system.set_alert_status("emergency")
-                            else:
-                                led_system.set_alert_status("soft")
-                        # Event name localization
-                        event_display_map = {
-                            'hard_fall': '낙상(확정)',
-                            'soft_immobility': '장시간 무동작(1단계)',
-                            'hard_immobility': '장시간 무동작(2단계)',
-                        }
-                        event_ko = event_display_map.get(event, event)
-                        # Localized alert text with control hint
-                        control_hint = "제어: /pause 로 일시중지, /resume 재개 또는 버튼 사용"
-                        text = (
-                            f"🚨 DuruOn 경보: {event_ko}\n"
-                            f"자세각≈{metrics['torso_angle']:.0f}° | 급강하={metrics['sudden_drop']} | 무동작={metrics['immobile']}\n"
-                            f"시간: {time.strftime('%Y-%m-%d %H:%M:%S')}\n{control_hint}"
-                        )
-                        # Assemble dynamic buttons (include pause/resume toggle)
-                        dyn_buttons = [("괜찮아요","ACK_OK"),("오탐지","ACK_FALSE"),("앱중지","STOP_APP")]
-                        if 'remote_paused' in locals() and locals()['remote_paused']:
-                            dyn_buttons.insert(2,("재개","RESUME_MON"))
+                    time_since_motion = _monotonic() - pir_system.last_motion_time if pir_system.last_motion_time else 0
+                    log.debug("📡 PIR DEBUG: monitoring=%s, last_motion=%.1fs ago, timeout=%ss",
+                              pir_system.is_monitoring, time_since_motion, pir_system.auto_sleep_timeout)
+                    if time_since_motion > pir_system.auto_sleep_timeout:
+                        log.debug("⚠️  PIR SHOULD DEACTIVATE BUT HASN'T!")
+                last_debug = current_time
+            if raw_present:
+                if event:
+                    event_count += 1
+                    last_activity_time = current_time
+                    if _led_alert:
+                        if "hard" in event or "fall" in event:
+                            _led_alert("emergency")
                         else:
-                            dyn_buttons.insert(2,("일시중지","PAUSE_MON"))
-                        notifier.send_text(text, buttons=dyn_buttons)
-                        try:
-                            img = render_skeleton_image(pose)
-                            notifier.send_photo(img, caption="Anonymized pose snapshot")
-                        except Exception as e:
-                            print("skeleton render failed:", e)
-                    else:
-                        if led_system:
-                            led_system.set_alert_status("none")
+                            _led_alert("soft")
+                    # Localized alert text; only the dynamic fields are substituted
+                    text = _ALERT_TMPL.format(
+                        event=_EVENT_KO.get(event, event),
+                        angle=metrics.torso_angle,
+                        drop=metrics.sudden_drop,
+                        immobile=metrics.immobile,
+                        ts=_timestamp(current_time),
+                    )
+                    # Pause/resume toggle button depends on current state
+                    dyn_buttons = _ALERT_BUTTONS_PAUSED if remote_paused else _ALERT_BUTTONS_RUNNING
+                    notify_executor.submit(_send_alert_with_photo, notifier, text, dyn_buttons, pose)
                 else:
-                    frame_count += 1
-                    if current_time - last_debug >= idle_debug_interval:
-                        pir_status = pir_system.get_status() if pir_system else {"is_monitoring": False}
-                        print(f"💤 IDLE: frames={frame_count}, PIR monitoring={pir_status.get('is_monitoring', False)}")
-                        last_debug = current_time
-                # Periodic heartbeat (outside of event branch to ensure regularity)
-                if heartbeat_enabled:
-                    if (current_time - last_heartbeat) >= heartbeat_interval:
+                    if _led_alert:
+                        _led_alert("none")
+            else:
+                frame_count += 1
+                if current_time - last_debug >= idle_debug_interval and log.isEnabledFor(logging.DEBUG):
+                    pir_status = pir_system.get_status() if pir_system else {"is_monitoring": False}
+                    log.debug("💤 IDLE: frames=%d, PIR monitoring=%s", frame_count, pir_status.get('is_monitoring', False))
+                    last_debug = current_time
+            # Periodic heartbeat (outside of event branch to ensure regularity)
+            if heartbeat_enabled:
+                if (current_time - last_heartbeat) >= heartbeat_interval:
+                    # An alert sent during this interval already proved liveness; just reschedule
+                    if last_activity_time <= last_heartbeat:
                         uptime_s = int(current_time - start_time)
                         hb_text = (
                             f"✅ DuruOn 상태 점검 (Heartbeat)\n"
-                            f"업타임={uptime_s//3600}h{(uptime_s%3600)//60}m 프레임={frame_count} 이벤트={event_count} 존재={metrics.get('present')}\n"
+                            f"업타임={uptime_s//3600}h{(uptime_s%3600)//60}m 프레임={frame_count} 이벤트={event_count} 존재={raw_present}\n"
                             f"카메라={'정상' if (cap and cap.isOpened()) else '중단'} PIR={'활성' if (pir_system and pir_system.is_monitoring) else '대기'}"
                         )
-                        notifier.send_text(hb_text)
-                        last_heartbeat = current_time
-            if use_camera and CV2_AVAILABLE:
-                sleep_time = max(0, 1.0/fps - 0.001)
-                if not monitoring_active or remote_paused:
-                    sleep_time *= 5
-                time.sleep(sleep_time)
-            else:
-                time.sleep(0.1 if (monitoring_active and not remote_paused) else 1.0)
-
-            # Poll Telegram callbacks periodically (non-blocking control)
-            now_cb = time.time()
-            if (now_cb - last_callback_poll) >= callback_poll_interval:
-                last_callback_poll = now_cb
-                try:
-                    cb_res = getattr(notifier, 'check_callbacks', lambda: None)()
-                    if cb_res == 'STOP_APP':
-                        notifier.send_text("🛑 애플리케이션이 사용자 요청(앱중지)으로 종료됩니다.")
-                        running = False
-                        continue
-                    if cb_res in ('PAUSE_MON','CMD_PAUSE'):
-                        if not remote_paused:
-                            remote_paused = True
-                            if led_system:
-                                led_system.set_system_status('idle')
-                                led_system.set_pir_status('clear')
-                            notifier.send_text("⏸️ 모니터링이 일시중지되었습니다. (/resume 또는 재개 버튼)")
-                    elif cb_res in ('RESUME_MON','CMD_RESUME'):
-                        if remote_paused:
-                            remote_paused = False
-                            if led_system:
-                                led_system.set_system_status('active') if monitoring_active else led_system.set_system_status('idle')
-                            notifier.send_text("▶️ 모니터링이 재개되었습니다.")
-                    if cb_res == 'CMD_PAUSE':
-                        if not remote_paused:
-                            remote_paused = True
-                            if led_system:
-                                led_system.set_system_status('idle')
-                                led_system.set_pir_status('clear')
-                            notifier.send_text("⏸️ 원격 명령으로 모니터링이 일시중지되었습니다. (/resume 으로 재개)")
-                    elif cb_res == 'CMD_RESUME':
-                        if remote_paused:
-                            remote_paused = False
-                            if led_system:
-                                led_system.set_system_status('active') if monitoring_active else led_system.set_system_status('idle')
-                            notifier.send_text("▶️ 모니터링이 재개되었습니다.")
-                    elif cb_res == 'CMD_STATUS':
-                        try:
-                            cam_ok = (cap and cap.isOpened()) if cap else False
-                            pir_state = pir_system.is_monitoring if pir_system else False
-                            notifier.send_text(
-                                f"ℹ️ 상태:\n활성={monitoring_active and not remote_paused} (pause={remote_paused})\n카메라={'정상' if cam_ok else '중단'} PIR={'활성' if pir_state else '대기'}\n프레임={frame_count} 이벤트={event_count}")
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
+                        notify_executor.submit(notifier.send_text, hb_text)
+                    last_heartbeat = current_time
+            if not camera_live:
+                _pace(0.1)
+            # With a live camera the next camera_worker.read() blocks until a new frame arrives,
+            # so frame arrival paces the loop (no sleep that could phase-lag a fresh frame)
+            _poll_callbacks()
     except KeyboardInterrupt:
         print("🛑 Keyboard interrupt received")
     except Exception as e:
@@ -709,8 +1126,10 @@ def run(config_path: str):
             pir_system.stop()
         if led_system:
             led_system.stop()
-        if cap:
-            cap.release()
+        infer_executor.shutdown(wait=True)
+        notify_executor.shutdown(wait=True)  # deliver alerts already queued
+        if cap is not None:
+            _release_camera()
             print("📷 Camera released")
         # Clean PID file
         try:
@@ -3,15 +3,18 @@ import requests
 from typing import Optional, List, Tuple
 
 class RateLimiter:
+    """Minimum spacing between calls; shared by the notify worker and the callback poller thread."""
     def __init__(self, min_interval_s: float = 1.0):
         self.min_interval_s = min_interval_s
         self.last_ts = 0.0
+        self._lock = threading.Lock()
     def wait(self):
-        now = time.time()
-        delta = now - self.last_ts
-        if delta < self.min_interval_s:
-            time.sleep(self.min_interval_s - delta)
-        self.last_ts = time.time()
+        with self._lock:  # held while sleeping so concurrent senders queue up in turn
+            now = time.time()
+            delta = now - self.last_ts
+            if delta < self.min_interval_s:
+                time.sleep(self.min_interval_s - delta)
+            self.last_ts = time.time()
 
 class TelegramNotifier:
     def __init__(self, bot_token: Optional[str]=None, chat_id: Optional[str]=None):
@@ -23,6 +26,7 @@ class TelegramNotifier:
         self.rl_global = RateLimiter(0.05) # safe global
         self.rl_chat   = RateLimiter(1.0)  # conservative per-chat limit
         self.last_update_id = 0
+        self.poll_error: Optional[Exception] = None  # last getUpdates failure (None after a successful poll)
         
     def send_text(self, text: str, buttons: Optional[List[Tuple[str,str]]]=None):
         self.rl_chat.wait(); self.rl_global.wait()
@@ -43,12 +47,15 @@ class TelegramNotifier:
         except Exception as e:
             print("Telegram send_photo failed:", e)
             
-    def check_callbacks(self):
-        """Check for button presses and respond accordingly"""
+    def check_callbacks(self, long_poll_timeout: int = 1):
+        """Check for button presses and respond accordingly.
+        Blocks up to long_poll_timeout seconds server-side waiting for an update."""
         try:
             response = requests.get(f"{self.api_base}/getUpdates", 
-                                  params={"offset": self.last_update_id + 1, "timeout": 1}, 
-                                  timeout=5)
+                                  params={"offset": self.last_update_id + 1, "timeout": long_poll_timeout}, 
+                                  timeout=long_poll_timeout + 5)
+            response.raise_for_status()
+            self.poll_error = None
             if response.status_code == 200:
                 data = response.json()
                 if data["ok"] and data["result"]:
@@ -107,7 +114,7 @@ class TelegramNotifier:
                                 self.send_text("사용 가능 명령: /status, /pause, /resume")
         except Exception as e:
             # Silently continue - don't spam logs with connection errors
-            pass
+            self.poll_error = e
         return None
 
 class DummyNotifier:
@@ -129,5 +136,5 @@ class DummyNotifier:
         self.photos += 1
         self.messages.append(("photo", caption))
         print(f"[DummyNotifier][PHOTO] {caption}")
-    def check_callbacks(self):
+    def check_callbacks(self, long_poll_timeout: int = 1):
         return None
\ No newline at end of file
@@ -1,7 +1,7 @@
 
 import numpy as np
 import time
-from typing import Dict
+from typing import Dict, List, Optional, Sequence
 try:  # pragma: no cover
     import cv2  # type: ignore
     _CV2_AVAILABLE = True
@@ -10,9 +10,9 @@ except Exception:
     _CV2_AVAILABLE = False
 
 try:  # pragma: no cover
-    from ..shared.pose import PoseResult, COCO17  # type: ignore
+    from ..shared.pose import PoseResult, COCO17, TORSO_IDX  # type: ignore
 except Exception:
-    from shared.pose import PoseResult, COCO17  # type: ignore
+    from shared.pose import PoseResult, COCO17, TORSO_IDX  # type: ignore
 
 try:
     import tflite_runtime.interpreter as tflite
@@ -22,41 +22,152 @@ except Exception:
     except Exception as e:
         tflite = None
 
+_TORSO_IDX = np.array(TORSO_IDX, dtype=np.int32)
+
 class MoveNetSinglePose:
-    def __init__(self, model_path: str, num_threads: int = 3):
+    def __init__(self, model_path: str, num_threads: int = 3, delegate: Optional[str] = None):
         if tflite is None:
             raise RuntimeError("No TFLite runtime available. Install tflite-runtime or tensorflow.")
-        self.interp = tflite.Interpreter(model_path=model_path, num_threads=max(1, num_threads))
+        # Without an explicit delegate the runtime's default XNNPACK CPU path is used (float and int8)
+        delegates = [tflite.load_delegate(delegate)] if delegate else None
+        self.interp = tflite.Interpreter(model_path=model_path, num_threads=max(1, num_threads),
+                                         experimental_delegates=delegates)
         self.interp.allocate_tensors()
         self.inp = self.interp.get_input_details()[0]
         self.out = self.interp.get_output_details()[0]
+        self._in_idx, self._out_idx = self.inp['index'], self.out['index']  # plain ints for the per-frame calls
         self.h, self.w = self.inp['shape'][1], self.inp['shape'][2]
         self.dtype = self.inp['dtype']
+        self._out_q = self._output_quant()
+        self._batch = int(self.inp['shape'][0])  # current input batch dimension
+        self._batch_ok = True  # cleared if the model rejects resize_tensor_input
+        # Reused every frame (set_tensor copies): no per-frame input/letterbox allocations
+        self._in_buf = self.alloc_input()
+        self._canvas = np.empty((self.h, self.w, 3), dtype=np.uint8)
+        self._gray = np.empty((self.h, self.w), dtype=np.uint8)  # letterbox for single-channel (GREY) frames
+
+    def _output_quant(self):
+        """(scale, zero_point) for integer-quantized outputs, None for float outputs."""
+        if np.issubdtype(self.out['dtype'], np.floating):
+            return None
+        scale, zero_point = self.out.get('quantization', (0.0, 0))
+        return (float(scale) or 1.0, int(zero_point))
+
+    def _get_output(self) -> np.ndarray:
+        """Output tensor as float32 [y, x, score] (dequantized for fully-integer models)."""
+        y = self.interp.get_tensor(self._out_idx)
+        if self._out_q is None:
+            return y
+        scale, zero_point = self._out_q
+        return (y.astype(np.float32) - zero_point) * scale
+
+    def _set_batch(self, b: int) -> bool:
+        """Resize the input tensor to batch b (allocate_tensors only on change). False if unsupported."""
+        if b == self._batch:
+            return True
+        if not self._batch_ok and b != 1:
+            return False  # batching disabled; going back to batch 1 is always allowed
+        try:
+            self.interp.resize_tensor_input(self._in_idx, [b, self.h, self.w, 3])
+            self.interp.allocate_tensors()
+        except Exception as e:
+            print(f"⚠️ MoveNet model does not support batch={b} ({e}); inferring frames one by one")
+            self._batch_ok = False
+            try:
+                self.interp.resize_tensor_input(self._in_idx, [self._batch, self.h, self.w, 3])
+                self.interp.allocate_tensors()
+            except Exception:
+                pass
+            return False
+        self._batch = b
+        self.inp = self.interp.get_input_details()[0]
+        self.out = self.interp.get_output_details()[0]
+        self._in_idx, self._out_idx = self.inp['index'], self.out['index']
+        self._out_q = self._output_quant()
+        return True
+
+    def alloc_input(self) -> np.ndarray:
+        """Allocate a model input tensor that can be passed to infer(..., out=buf) and reused."""
+        return np.empty((1, self.h, self.w, 3), dtype=self.dtype)
 
-    def _preprocess(self, bgr):
+    def _preprocess(self, bgr, out=None):
         h0, w0 = bgr.shape[:2]
         scale = min(self.w/w0, self.h/h0)
         nw, nh = int(w0*scale), int(h0*scale)
-        resized = cv2.resize(bgr, (nw, nh), interpolation=cv2.INTER_LINEAR)
-        canvas = np.zeros((self.h, self.w, 3), dtype=np.uint8)
+        if out is None:
+            out = self.alloc_input()
+        # uint8 models: letterbox directly into the input tensor
+        canvas = out[0] if self.dtype == np.uint8 else self._canvas
         y1, x1 = (self.h-nh)//2, (self.w-nw)//2
-        canvas[y1:y1+nh, x1:x1+nw] = resized
-        rgb = cv2.cvtColor(canvas, cv2.COLOR_BGR2RGB)
-        x = rgb.astype(np.float32) / 255.0 if self.dtype == np.float32 else rgb.astype(self.dtype)
-        return np.expand_dims(x, 0)
+        if bgr.ndim == 2:
+            # Grayscale capture: resize one channel, then replicate it into the RGB input
+            self._gray.fill(0)
+            cv2.resize(bgr, (nw, nh), dst=self._gray[y1:y1+nh, x1:x1+nw], interpolation=cv2.INTER_LINEAR)
+            cv2.cvtColor(self._gray, cv2.COLOR_GRAY2RGB, dst=canvas)
+        else:
+            canvas.fill(0)
+            cv2.resize(bgr, (nw, nh), dst=canvas[y1:y1+nh, x1:x1+nw], interpolation=cv2.INTER_LINEAR)
+            cv2.cvtColor(canvas, cv2.COLOR_BGR2RGB, dst=canvas)
+        if self.dtype == np.float32:
+            np.divide(canvas, 255.0, out=out[0], dtype=np.float32)
+        elif self.dtype != np.uint8:
+            out[0] = canvas
+        return out
 
-    def infer(self, bgr) -> PoseResult:
+    def infer(self, bgr, out=None) -> PoseResult:
+        """Run pose inference on a BGR frame. Preprocesses into the instance's input buffer
+        unless `out` (a buffer from alloc_input()) is given."""
         if not _CV2_AVAILABLE:
             raise RuntimeError("cv2 not available - cannot run MoveNet inference")
-        x = self._preprocess(bgr)
-        self.interp.set_tensor(self.inp['index'], x)
+        self._set_batch(1)
+        x = self._preprocess(bgr, self._in_buf if out is None else out)
+        self.interp.set_tensor(self._in_idx, x)
         self.interp.invoke()
-        y = self.interp.get_tensor(self.out['index'])
+        y = self._get_output()
         # Accept shapes [1,1,17,3] or [1,17,3]
         if y.ndim == 4 and y.shape[2] == 17 and y.shape[3] == 3:
-            kp = {COCO17[i]:(float(y[0,0,i,1]), float(y[0,0,i,0]), float(y[0,0,i,2])) for i in range(17)}
+            kp_arr = y[0, 0]
         elif y.ndim == 3 and y.shape[1] == 17 and y.shape[2] == 3:
-            kp = {COCO17[i]:(float(y[0,i,1]), float(y[0,i,0]), float(y[0,i,2])) for i in range(17)}
+            kp_arr = y[0]
+        else:
+            kp_arr = None
+        return self._to_pose(kp_arr, time.time())
+
+    def infer_batch(self, frames: Sequence, timestamps: Optional[Sequence[float]] = None) -> List[PoseResult]:
+        """Infer several BGR frames with one invoke (input resized to [B,H,W,3] once per batch size).
+        Falls back to per-frame infer() when the model has a fixed batch dimension."""
+        if not _CV2_AVAILABLE:
+            raise RuntimeError("cv2 not available - cannot run MoveNet inference")
+        b = len(frames)
+        if b == 0:
+            return []
+        if b == 1 or not self._set_batch(b):
+            poses = [self.infer(f) for f in frames]
+        else:
+            x = np.empty((b, self.h, self.w, 3), dtype=self.dtype)
+            for i, f in enumerate(frames):
+                self._preprocess(f, out=x[i:i+1])
+            self.interp.set_tensor(self._in_idx, x)
+            self.interp.invoke()
+            y = self._get_output()
+            if y.size == b * 17 * 3:
+                ys = y.reshape(b, 17, 3)
+                now = time.time()
+                poses = [self._to_pose(ys[i], now) for i in range(b)]
+            else:
+                # Unexpected batched output layout: never hand out keypoint-less poses for the batch
+                print(f"⚠️ MoveNet batch={b} output shape {tuple(y.shape)} not [{b},17,3]; inferring frames one by one")
+                self._batch_ok = False
+                poses = [self.infer(f) for f in frames]
+        if timestamps is not None:
+            for p, ts in zip(poses, timestamps):
+                p.ts = ts
+        return poses
+
+    def _to_pose(self, kp_arr, ts: float) -> PoseResult:
+        """Build a PoseResult from a (17,3) [y, x, score] array (None -> no keypoints)."""
+        if kp_arr is not None:
+            kp = {COCO17[i]:(float(kp_arr[i,1]), float(kp_arr[i,0]), float(kp_arr[i,2])) for i in range(17)}
         else:
             kp = {}
         # Joint-specific confidence filtering
@@ -67,4 +178,5 @@ class MoveNetSinglePose:
             elif name.endswith('knee') and c < 0.06:
                 del kp[name]
         score = float(np.mean([v[2] for v in kp.values()])) if kp else 0.0
-        return PoseResult(kp, score, time.time())
+        torso = kp_arr[_TORSO_IDX] if kp_arr is not None else None
+        return PoseResult(kp, score, ts, kp_arr, torso)
@@ -0,0 +1,45 @@
+"""Scalar math used by RiskEngine on every frame.
+
+Compiled with numba when it is installed; otherwise the same functions run
+as plain Python, so results are identical either way.
+"""
+import math
+
+try:
+    from numba import njit  # type: ignore
+    NUMBA_AVAILABLE = True
+except Exception:  # numba optional (heavy install on a Pi)
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):  # type: ignore
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+
+@njit(cache=True, fastmath=True)
+def torso_angle(vx, vy):
+    """Upright angle in degrees (90 = upright, 0 = horizontal) of the hip->shoulder vector."""
+    if abs(vx) < 0.001 and abs(vy) < 0.001:
+        return 0.0
+    angle_deg = 90.0 - math.degrees(math.atan2(abs(vx), abs(vy)))
+    return max(0.0, min(90.0, angle_deg))
+
+
+@njit(cache=True, fastmath=True)
+def motion_magnitude(hx, hy, sx, sy):
+    """Hip displacement plus shoulder displacement (each Euclidean)."""
+    return math.sqrt(hx * hx + hy * hy) + math.sqrt(sx * sx + sy * sy)
+
+
+@njit(cache=True, fastmath=True)
+def immobile_check(arr, eps):
+    """True when the mean of a 1-D motion array is below eps (False when empty)."""
+    n = len(arr)
+    if n == 0:
+        return False
+    total = 0.0
+    for i in range(n):
+        total += arr[i]
+    return total / n < eps
+
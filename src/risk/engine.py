@@ -1,15 +1,24 @@
-from collections import deque
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
-import math, time
+from typing import Optional, Dict
+import time
+import logging
+import numpy as np
 from datetime import datetime
 try:  # pragma: no cover
     from ..shared.pose import PoseResult  # type: ignore
 except Exception:  # allow running without package context
     from shared.pose import PoseResult  # type: ignore
+try:  # pragma: no cover
+    from . import _kernels  # type: ignore
+except Exception:
+    import _kernels  # type: ignore
+
+# Per-frame diagnostics; formatted only when DEBUG is enabled (logging.status_debug)
+log = logging.getLogger('DuruOn.Risk')
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RiskConfig:
+    """Fall/immobility thresholds; immutable and slotted since update() reads it every frame."""
     angle_threshold_deg: float = 50.0
     drop_threshold: float = 0.25
     drop_window_s: float = 0.7
@@ -35,13 +44,104 @@ class RiskConfig:
     # Extreme low-angle fallback (treat sustained very low angle + immobility as fall even without detected drop)
     extreme_low_angle_deg: float = 10.0
     extreme_low_angle_fast_confirm_s: float = 4.0
+    # History ring size in frames (0 = derive from hard_immobility_s and fps)
+    ring_capacity: int = 0
+
+@dataclass(slots=True)
+class RiskMetrics:
+    """Per-frame result of RiskEngine.update(); dict-style get() / [] kept for existing callers."""
+    present: bool = False
+    event: Optional[str] = None
+    torso_angle: float = -1.0  # -1 = no usable hip/shoulder pose
+    sudden_drop: bool = False
+    immobile: bool = False
+    rapid_angle_change: bool = False
+    angle_change: float = 0.0
+    angle_change_total: float = 0.0
+    vertical_dy: float = 0.0
+    hip_vy: float = 0.0
+    position_change_total: float = 0.0
+    drop_component_dy: bool = False
+    drop_component_angle: bool = False
+    drop_component_pos: bool = False
+    drop_threshold: float = 0.0
+    angle_change_threshold_cfg: float = 0.0
+    position_change_threshold_cfg: float = 0.0
+    is_shower_time: bool = False
+    adaptive_motion_eps: float = 0.0
+    adaptive_soft_threshold: float = 0.0
+    adaptive_hard_threshold: float = 0.0
+    debug_vx: float = 0.0
+    debug_vy: float = 0.0
+    fallback_used: bool = False
+    fallback_reason: Optional[str] = None
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+# History ring columns: timestamp, mid-hip x/y, mid-shoulder x/y, motion, torso angle, valid (hip+shoulder present)
+_TS, _HX, _HY, _SX, _SY, _MOTION, _ANGLE, _VALID = range(8)
+
+class _HistoryRing:
+    """Fixed-size history stored twice back-to-back so the newest `count` rows are always one
+    contiguous, chronological view (no reallocation or reordering per frame)."""
+    def __init__(self, capacity: int):
+        self.capacity = max(2, int(capacity))
+        self._buf = np.zeros((2 * self.capacity, 8), dtype=np.float64)
+        self._pos = -1
+        self.count = 0
+
+    def append(self, ts, mh=None, ms=None, motion=0.0, angle=None):
+        self._pos = (self._pos + 1) % self.capacity
+        row = self._buf[self._pos]
+        row[_TS] = ts
+        if mh and ms:
+            row[_HX], row[_HY] = mh
+            row[_SX], row[_SY] = ms
+            row[_ANGLE] = angle
+            row[_VALID] = 1.0
+        else:
+            row[_HX:_SY + 1] = 0.0
+            row[_ANGLE] = 0.0
+            row[_VALID] = 0.0
+        row[_MOTION] = motion
+        self._buf[self._pos + self.capacity] = row
+        if self.count < self.capacity:
+            self.count += 1
+
+    def __len__(self):
+        return self.count
+
+    def view(self) -> np.ndarray:
+        """Chronological (oldest..newest) rows; a view into the buffer, valid until the next append."""
+        end = self._pos + self.capacity + 1
+        return self._buf[end - self.count:end]
+
+    def since(self, t0: float) -> np.ndarray:
+        """Rows with timestamp >= t0 (timestamps are appended in order)."""
+        v = self.view()
+        return v[np.searchsorted(v[:, _TS], t0, side='left'):]
 
 class RiskEngine:
     def __init__(self, fps: int = 15, cfg: RiskConfig = None):
         self.fps = max(1, int(fps))
         self.cfg = cfg or RiskConfig()
-        # History stores tuples: (timestamp, mid_hip, mid_shoulder, motion_scalar, torso_angle)
-        self.hist = deque(maxlen=int(max(5, self.cfg.hard_immobility_s) + 5) * self.fps)
+        # History ring rows: (timestamp, mid_hip, mid_shoulder, motion_scalar, torso_angle, valid)
+        capacity = self.cfg.ring_capacity or int(max(5, self.cfg.hard_immobility_s) + 5) * self.fps
+        self.hist = _HistoryRing(capacity)
+        if _kernels.NUMBA_AVAILABLE:
+            # Compile (or load from cache) now, with update()'s argument types, not on the first person frame
+            _kernels.torso_angle(0.0, -1.0)
+            _kernels.motion_magnitude(0.0, 0.0, 0.0, 0.0)
+            # since() columns are strided, or contiguous when they hold <= 1 row: both layouts occur
+            _kernels.immobile_check(np.zeros((2, 8))[:, _MOTION], 0.05)
+            _kernels.immobile_check(np.zeros(1), 0.05)
         self.last_alert_ts = 0.0
         self.soft_timer_start = None  # immobility timer start
         # Fall candidate tracking
@@ -55,6 +155,14 @@ class RiskEngine:
             return None
         return ((pa[0]+pb[0])/2.0, (pa[1]+pb[1])/2.0)
 
+    def _torso_mids(self, t):
+        """(mid_hip, mid_shoulder) from a (4,3) [y, x, score] torso array; same thresholds as _mid."""
+        thr = self.cfg.min_kp_confidence
+        (lsy, lsx, lsc), (rsy, rsx, rsc), (lhy, lhx, lhc), (rhy, rhx, rhc) = t.tolist()
+        mh = ((lhx+rhx)/2.0, (lhy+rhy)/2.0) if lhc >= thr and rhc >= thr else None
+        ms = ((lsx+rsx)/2.0, (lsy+rsy)/2.0) if lsc >= thr and rsc >= thr else None
+        return mh, ms
+
     # --- Helper methods (unified versions) ---
     def _is_shower_time(self) -> bool:
         if not self.cfg.shower_mode_enabled:
@@ -83,12 +191,15 @@ class RiskEngine:
             'hard_immobility': hard_imm,
         }
 
-    def update(self, pose: PoseResult) -> Dict[str, Any]:
+    def update(self, pose: PoseResult) -> RiskMetrics:
         ts = pose.ts
         kp = pose.keypoints
         fallback_used = False
-        mh = self._mid("left_hip","right_hip", kp)
-        ms = self._mid("left_shoulder","right_shoulder", kp)
+        if pose.torso is not None:
+            mh, ms = self._torso_mids(pose.torso)
+        else:
+            mh = self._mid("left_hip","right_hip", kp)
+            ms = self._mid("left_shoulder","right_shoulder", kp)
 
         # Fallback estimation when primary midpoints missing (low confidence hips or shoulders)
         if not mh:
@@ -119,24 +230,24 @@ class RiskEngine:
             recent_fall = (self.pending_fall_ts and ts - self.pending_fall_ts < 30.0) or (ts - self.last_alert_ts < 60.0)
             
             if recent_fall:
-                print(f"🔍 FALLBACK MODE: Poor pose detection after recent fall - continuing immobility monitoring")
+                log.debug("🔍 FALLBACK MODE: Poor pose detection after recent fall - continuing immobility monitoring")
                 # Continue immobility timer if it was already started
                 if self.soft_timer_start:
                     time_immobile = ts - self.soft_timer_start
-                    print(f"🔍 FALLBACK IMMOBILE: {time_immobile:.1f}s since fall/timer start")
+                    log.debug("🔍 FALLBACK IMMOBILE: %.1fs since fall/timer start", time_immobile)
                     
                     # Check for escalation even without good pose data
                     if time_immobile >= 30.0:  # Escalate after 30s of no good pose detection post-fall
                         if ts - self.last_alert_ts >= self.cfg.cooldown_s:
                             print(f"🚨 FALLBACK ALERT: No pose recovery {time_immobile:.1f}s after fall")
                             self.last_alert_ts = ts
-                            self.hist.append((ts, None, None, 0.0, None))
-                            return {
-                                "present": False, 
-                                "event": "hard_immobility", 
-                                "fallback_used": True,
-                                "fallback_reason": "no_pose_after_fall"
-                            }
+                            self.hist.append(ts)
+                            return RiskMetrics(
+                                present=False,
+                                event="hard_immobility",
+                                fallback_used=True,
+                                fallback_reason="no_pose_after_fall",
+                            )
                 else:
                     # Start fallback immobility timer if recent fall but no timer yet
                     self.soft_timer_start = ts
@@ -147,8 +258,8 @@ class RiskEngine:
                 self.pending_fall_ts = None
             
             # Partial presence could still indicate motion; store placeholder for motion continuity
-            self.hist.append((ts, None, None, 0.0, None))
-            return {"present": False, "event": None, "fallback_used": fallback_used}
+            self.hist.append(ts)
+            return RiskMetrics(present=False, event=None, fallback_used=fallback_used)
 
         # CORRECTED: Proper angle calculation for torso uprightness
         # Vector from hip to shoulder (torso direction)
@@ -159,41 +270,32 @@ class RiskEngine:
         # When upright: vy < 0 (shoulders above hips)
         # When horizontal: vy ≈ 0 (shoulders level with hips)
         
-        if abs(vx) < 0.001 and abs(vy) < 0.001:
-            # Hip and shoulder at same level - horizontal position
-            angle_deg = 0.0
-        else:
-            # Calculate angle from vertical axis (upright = 90°, horizontal = 0°)
-            # atan2(abs(vx), abs(vy)) gives angle from vertical
-            angle_rad = math.atan2(abs(vx), abs(vy))  
-            angle_deg = math.degrees(angle_rad)
-            
-            # When person is upright: vx small, vy large (negative) -> angle near 0° from vertical = 90° from horizontal
-            # When person is horizontal: vx large, vy small -> angle near 90° from vertical = 0° from horizontal
-            angle_deg = 90.0 - angle_deg  # Convert to "upright angle"
-            angle_deg = max(0.0, min(90.0, angle_deg))  # Clamp to valid range
+        # Angle from vertical via atan2(|vx|, |vy|), converted to "upright angle"
+        # (upright = 90°, horizontal = 0°, hip/shoulder coincident = 0°), clamped to [0, 90]
+        angle_deg = _kernels.torso_angle(vx, vy)
 
         # Enhanced motion detection
         motion = 0.0
         angle_change = 0.0
         hip_vy = 0.0  # positive means moving downward (image y increases downward)
         if self.hist:
-            prev_ts, pmh, pms, _, prev_angle = self.hist[-1]
-            if pmh and pms and prev_angle is not None:
-                motion = math.hypot(mh[0]-pmh[0], mh[1]-pmh[1]) + math.hypot(ms[0]-pms[0], ms[1]-pms[1])
-                angle_change = abs(angle_deg - prev_angle)
-                dt = ts - prev_ts
+            prev = self.hist.view()[-1]
+            if prev[_VALID]:
+                motion = _kernels.motion_magnitude(mh[0]-prev[_HX], mh[1]-prev[_HY], ms[0]-prev[_SX], ms[1]-prev[_SY])
+                angle_change = abs(angle_deg - prev[_ANGLE])
+                dt = ts - prev[_TS]
                 if dt > 1e-6:
-                    hip_vy = (mh[1]-pmh[1]) / dt
+                    hip_vy = (mh[1]-prev[_HY]) / dt
 
-        self.hist.append((ts, mh, ms, motion, angle_deg))
+        self.hist.append(ts, mh, ms, motion, angle_deg)
 
         # Get adaptive thresholds (unified)
         is_shower_time = self._is_shower_time()
         thresholds = self._get_adaptive_thresholds(angle_deg, is_shower_time)
 
         # Enhanced sudden drop detection
-        window = [(t,h,s,m,a) for (t,h,s,m,a) in self.hist if h and s and t >= ts - self.cfg.drop_window_s]
+        recent = self.hist.since(ts - self.cfg.drop_window_s)
+        window = recent[recent[:, _VALID] > 0]
         sudden_drop = False
         rapid_angle_change = False
         large_position_change = False
@@ -204,18 +306,17 @@ class RiskEngine:
         dy_meet = angle_meet = pos_meet = False
         if len(window) >= 2:
             # FIXED: Original vertical drop detection - access y coordinate correctly
-            dy = mh[1] - window[0][1][1]
+            first = window[0]
+            dy = mh[1] - float(first[_HY])
             dy_meet = dy >= self.cfg.drop_threshold
             # Rapid angle change detection
-            angle_start = window[0][4]
+            angle_start = float(first[_ANGLE])
             angle_change_total = abs(angle_deg - angle_start)
             angle_meet = angle_change_total >= self.cfg.angle_change_threshold
             rapid_angle_change = angle_meet
             # Enhanced position change detection
-            hip_start = window[0][1]
-            shoulder_start = window[0][2]
-            total_position_change = (math.hypot(mh[0]-hip_start[0], mh[1]-hip_start[1]) +
-                                     math.hypot(ms[0]-shoulder_start[0], ms[1]-shoulder_start[1]))
+            total_position_change = _kernels.motion_magnitude(mh[0]-first[_HX], mh[1]-first[_HY],
+                                                             ms[0]-first[_SX], ms[1]-first[_SY])
             pos_meet = total_position_change >= self.cfg.position_change_threshold
             large_position_change = pos_meet
 
@@ -223,13 +324,16 @@ class RiskEngine:
         sudden_drop = dy_meet or angle_meet or pos_meet
         
         # DEBUG: Show sudden drop detection details
-        if len(window) >= 2:
-            print(f"🔍 DROP DEBUG: dy={dy:.3f} (need>{self.cfg.drop_threshold}) angle_change={angle_change_total:.1f}° (need>{getattr(self.cfg, 'angle_change_threshold', 30.0)}) pos_change={total_position_change:.3f} (need>{getattr(self.cfg, 'position_change_threshold', 0.15)})")
-            print(f"🔍 DROP MEET: dy_meet={dy_meet}, angle_meet={angle_meet}, pos_meet={pos_meet} → sudden_drop={sudden_drop}")
+        if len(window) >= 2 and log.isEnabledFor(logging.DEBUG):
+            log.debug("🔍 DROP DEBUG: dy=%.3f (need>%s) angle_change=%.1f° (need>%s) pos_change=%.3f (need>%s)",
+                      dy, self.cfg.drop_threshold, angle_change_total, self.cfg.angle_change_threshold,
+                      total_position_change, self.cfg.position_change_threshold)
+            log.debug("🔍 DROP MEET: dy_meet=%s, angle_meet=%s, pos_meet=%s → sudden_drop=%s",
+                      dy_meet, angle_meet, pos_meet, sudden_drop)
 
         # Adaptive immobility detection
-        motions = [m for (t,_,_,m,_) in self.hist if t >= ts - thresholds['immobile_window']]
-        immobile = (sum(motions)/max(1,len(motions))) < thresholds['motion_eps'] if motions else False
+        motions = self.hist.since(ts - thresholds['immobile_window'])[:, _MOTION]
+        immobile = bool(_kernels.immobile_check(motions, thresholds['motion_eps']))
 
         # Initialize variables
         event = None
@@ -317,31 +421,31 @@ class RiskEngine:
                         self.pending_fall_type = None
                         self.soft_timer_start = None
 
-        return {
-            "present": True,
-            "torso_angle": angle_deg,
-            "sudden_drop": sudden_drop,
-            "immobile": immobile,
-            "event": event,
-            "rapid_angle_change": rapid_angle_change if len(window) >= 2 else False,
-            "angle_change": angle_change,
-            "angle_change_total": angle_change_total,
-            "vertical_dy": dy,
-            "hip_vy": hip_vy,
-            "position_change_total": total_position_change,
-            "drop_component_dy": dy_meet,
-            "drop_component_angle": angle_meet,
-            "drop_component_pos": pos_meet,
-            "drop_threshold": self.cfg.drop_threshold,
-            "angle_change_threshold_cfg": self.cfg.angle_change_threshold,
-            "position_change_threshold_cfg": self.cfg.position_change_threshold,
-            "is_shower_time": is_shower_time,
-            "adaptive_motion_eps": thresholds['motion_eps'],
-            "adaptive_soft_threshold": thresholds['soft_immobility'],
-            "adaptive_hard_threshold": thresholds['hard_immobility'],
-            "debug_vx": vx,
-            "debug_vy": vy,
-            "fallback_used": fallback_used
-        }
+        return RiskMetrics(
+            present=True,
+            torso_angle=angle_deg,
+            sudden_drop=sudden_drop,
+            immobile=immobile,
+            event=event,
+            rapid_angle_change=rapid_angle_change if len(window) >= 2 else False,
+            angle_change=angle_change,
+            angle_change_total=angle_change_total,
+            vertical_dy=dy,
+            hip_vy=hip_vy,
+            position_change_total=total_position_change,
+            drop_component_dy=dy_meet,
+            drop_component_angle=angle_meet,
+            drop_component_pos=pos_meet,
+            drop_threshold=self.cfg.drop_threshold,
+            angle_change_threshold_cfg=self.cfg.angle_change_threshold,
+            position_change_threshold_cfg=self.cfg.position_change_threshold,
+            is_shower_time=is_shower_time,
+            adaptive_motion_eps=thresholds['motion_eps'],
+            adaptive_soft_threshold=thresholds['soft_immobility'],
+            adaptive_hard_threshold=thresholds['hard_immobility'],
+            debug_vx=vx,
+            debug_vy=vy,
+            fallback_used=fallback_used,
+        )
     
     # (Removed duplicate helper definitions below)
\ No newline at end of file
@@ -0,0 +1,17 @@
+import functools
+import os
+
+@functools.lru_cache(maxsize=1)
+def is_raspberry_pi() -> bool:
+    """True when /proc/cpuinfo reports Raspberry Pi hardware (probed once per process).
+    DURUON_PI=1/0 in the environment overrides the probe."""
+    env = os.environ.get('DURUON_PI')
+    if env in ('0', '1'):
+        return env == '1'
+    try:
+        if os.path.exists('/proc/cpuinfo'):
+            with open('/proc/cpuinfo', 'r') as f:
+                return 'raspberry' in f.read().lower()
+    except Exception:
+        pass
+    return False
@@ -1,6 +1,6 @@
 
 from dataclasses import dataclass
-from typing import Dict, Tuple, Optional
+from typing import Dict, Tuple, Optional, Any
 import time
 
 # COCO-17 keypoint names in MoveNet order
@@ -11,6 +11,9 @@ COCO17 = [
     "left_knee","right_knee","left_ankle","right_ankle"
 ]
 
+# COCO17 indices of left/right shoulder and left/right hip (PoseResult.torso row order)
+TORSO_IDX = (5, 6, 11, 12)
+
 SKELETON_EDGES = [
     ("left_shoulder","right_shoulder"),("left_hip","right_hip"),
     ("left_shoulder","left_elbow"),("left_elbow","left_wrist"),
@@ -25,5 +28,7 @@ class PoseResult:
     keypoints: Dict[str, Tuple[float, float, float]]  # name -> (x, y, score) normalized [0,1]
     score: float                                      # mean visibility of visible keypoints
     ts: float                                         # timestamp (seconds)
+    kps_array: Optional[Any] = None                   # raw (17,3) [y, x, score] array in COCO17 order (MoveNet), unfiltered
+    torso: Optional[Any] = None                       # (4,3) [y, x, score] rows for TORSO_IDX (shoulders, hips)
     def now_like(self) -> "PoseResult":
-        return PoseResult(self.keypoints, self.score, time.time())
+        return PoseResult(self.keypoints, self.score, time.time(), self.kps_array, self.torso)
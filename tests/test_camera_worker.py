@@ -0,0 +1,105 @@
+import threading
+import time
+import unittest
+
+from src.core.camera import CameraWorker
+
+class FakeCapture:
+    """Frames are integers; grab() blocks until release_frames() allows another one."""
+    def __init__(self, fail_after=None):
+        self.sem = threading.Semaphore(0)
+        self.grabbed = 0
+        self.retrieved = 0
+        self.released = False
+        self.fail_after = fail_after
+    def release_frames(self, n=1):
+        for _ in range(n):
+            self.sem.release()
+    def grab(self):
+        if not self.sem.acquire(timeout=2.0):
+            return False
+        if self.fail_after is not None and self.grabbed >= self.fail_after:
+            return False
+        self.grabbed += 1
+        return True
+    def retrieve(self):
+        self.retrieved += 1
+        return True, self.grabbed
+    def release(self):
+        self.released = True
+
+def _wait_for(pred, timeout=1.0):
+    end = time.monotonic() + timeout
+    while not pred():
+        if time.monotonic() > end:
+            return False
+        time.sleep(0.005)
+    return True
+
+class TestCameraWorker(unittest.TestCase):
+    def setUp(self):
+        self.cap = FakeCapture()
+        self.worker = CameraWorker(self.cap)
+        self.worker.start()
+
+    def tearDown(self):
+        self.cap.release_frames(10)  # unblock grab() so the thread can exit
+        self.worker.stop()
+
+    def test_read_returns_newest_frame_only(self):
+        self.cap.release_frames(3)
+        self.assertTrue(_wait_for(lambda: self.worker._seq == 3))
+        self.assertEqual(self.worker.read(timeout=1.0), (True, 3))  # frames 1 and 2 are dropped
+
+    def test_read_waits_for_a_newer_frame(self):
+        self.cap.release_frames(1)
+        self.assertEqual(self.worker.read(timeout=1.0), (True, 1))
+        # Same frame is never returned twice
+        self.assertEqual(self.worker.read(timeout=0.1), (False, None))
+        self.cap.release_frames(1)
+        self.assertEqual(self.worker.read(timeout=1.0), (True, 2))
+
+    def test_read_timeout(self):
+        t0 = time.monotonic()
+        self.assertEqual(self.worker.read(timeout=0.1), (False, None))
+        self.assertGreaterEqual(time.monotonic() - t0, 0.09)
+
+    def test_want_decode_gating(self):
+        self.worker.want_decode = False
+        self.cap.release_frames(2)
+        self.assertTrue(_wait_for(lambda: self.worker._seq == 2))
+        self.assertEqual(self.cap.retrieved, 0)  # grabbed, not decoded
+        self.assertEqual(self.worker.snapshot()[1][1], None)
+        # Decoding requested: frames grabbed before that are skipped, the next decoded one is returned
+        self.worker.want_decode = True
+        self.cap.release_frames(1)
+        self.assertEqual(self.worker.read(timeout=1.0), (True, 3))
+        self.assertEqual(self.cap.retrieved, 1)
+
+    def test_failure_propagates(self):
+        cap = FakeCapture(fail_after=1)
+        worker = CameraWorker(cap)
+        worker.start()
+        try:
+            cap.release_frames(1)
+            self.assertEqual(worker.read(timeout=1.0), (True, 1))
+            cap.release_frames(1)  # next grab fails
+            self.assertEqual(worker.read(timeout=1.0), (False, None))
+            self.assertFalse(worker.ok)
+            worker.join(1.0)
+            self.assertFalse(worker.is_alive())
+            self.assertFalse(worker.snapshot()[0])
+            self.assertTrue(cap.released)  # the worker releases its own capture on exit
+        finally:
+            worker.stop()
+
+    def test_stop_reports_hung_grab_and_defers_release(self):
+        # grab() is blocked (no frame released): stop() times out and the capture stays open
+        self.assertFalse(self.worker.stop(timeout=0.1))
+        self.assertFalse(self.cap.released)
+        self.cap.release_frames(1)  # grab() returns; the loop sees the stop request
+        self.assertTrue(self.worker.stop(timeout=1.0))
+        self.assertTrue(self.cap.released)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import random
+import unittest
+from collections import deque
+
+from src.risk.engine import _HistoryRing, _TS, _HX, _HY, _SX, _SY, _MOTION, _ANGLE, _VALID
+
+def _row(entry):
+    """Deque tuple (ts, mh, ms, motion, angle) -> ring row layout."""
+    ts, mh, ms, motion, angle = entry
+    if mh and ms:
+        return [ts, mh[0], mh[1], ms[0], ms[1], motion, angle, 1.0]
+    return [ts, 0.0, 0.0, 0.0, 0.0, motion, 0.0, 0.0]
+
+class TestHistoryRing(unittest.TestCase):
+    def test_empty(self):
+        ring = _HistoryRing(5)
+        self.assertEqual(len(ring), 0)
+        self.assertFalse(ring)
+        self.assertEqual(ring.view().shape, (0, 8))
+        self.assertEqual(len(ring.since(0.0)), 0)
+
+    def test_minimum_capacity(self):
+        self.assertEqual(_HistoryRing(0).capacity, 2)
+
+    def test_fill_without_wraparound(self):
+        ring = _HistoryRing(4)
+        for i in range(3):
+            ring.append(float(i), (0.5, 0.6), (0.5, 0.3), 0.01 * i, 80.0)
+        v = ring.view()
+        self.assertEqual(len(ring), 3)
+        self.assertEqual(list(v[:, _TS]), [0.0, 1.0, 2.0])
+        self.assertTrue((v[:, _VALID] == 1.0).all())
+
+    def test_overflow_keeps_newest_in_order(self):
+        ring = _HistoryRing(4)
+        for i in range(11):  # wraps around several times
+            ring.append(float(i), motion=float(i))
+        v = ring.view()
+        self.assertEqual(len(ring), 4)
+        self.assertEqual(list(v[:, _TS]), [7.0, 8.0, 9.0, 10.0])
+        self.assertEqual(list(v[:, _MOTION]), [7.0, 8.0, 9.0, 10.0])
+        self.assertEqual(v[-1, _TS], 10.0)
+
+    def test_invalid_row_clears_previous_slot(self):
+        ring = _HistoryRing(2)
+        ring.append(0.0, (0.1, 0.2), (0.3, 0.4), 0.5, 45.0)
+        ring.append(1.0, (0.1, 0.2), (0.3, 0.4), 0.5, 45.0)
+        ring.append(2.0)  # overwrites the slot of ts=0.0
+        last = ring.view()[-1]
+        self.assertEqual(list(last), [2.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0])
+
+    def test_since_window(self):
+        ring = _HistoryRing(6)
+        for i in range(10):
+            ring.append(i * 0.5)
+        # Rows held: ts 2.0 .. 4.5
+        self.assertEqual(list(ring.since(3.0)[:, _TS]), [3.0, 3.5, 4.0, 4.5])
+        self.assertEqual(list(ring.since(3.2)[:, _TS]), [3.5, 4.0, 4.5])
+        self.assertEqual(len(ring.since(0.0)), 6)   # older than everything held
+        self.assertEqual(len(ring.since(5.0)), 0)   # newer than everything held
+
+    def test_matches_deque_reference(self):
+        rng = random.Random(1234)
+        for capacity in (2, 3, 7, 16):
+            ring = _HistoryRing(capacity)
+            ref = deque(maxlen=capacity)
+            ts = 0.0
+            for _ in range(5 * capacity + 3):
+                ts += rng.uniform(0.01, 0.2)
+                if rng.random() < 0.7:
+                    entry = (ts, (rng.random(), rng.random()), (rng.random(), rng.random()),
+                             rng.random(), rng.uniform(0, 90))
+                else:
+                    entry = (ts, None, None, 0.0, None)
+                ref.append(entry)
+                ring.append(*entry)
+
+                self.assertEqual(len(ring), len(ref))
+                self.assertEqual(ring.view().tolist(), [_row(e) for e in ref])
+                t0 = ts - rng.uniform(0.0, 1.0)
+                expected = [_row(e) for e in ref if e[0] >= t0]
+                self.assertEqual(ring.since(t0).tolist(), expected)
+                # Old engine's drop window: valid rows only
+                window = ring.since(t0)
+                window = window[window[:, _VALID] > 0]
+                self.assertEqual(window[:, [_HX, _HY, _SX, _SY, _ANGLE]].tolist(),
+                                 [[e[1][0], e[1][1], e[2][0], e[2][1], e[4]] for e in ref if e[1] and e[2] and e[0] >= t0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import math
+import unittest
+
+import numpy as np
+
+from src.risk import _kernels
+
+def _py(fn):
+    """Pure-Python body of a kernel (numba keeps it as py_func; without numba it is fn itself)."""
+    return getattr(fn, 'py_func', fn)
+
+def _torso_vectors(n, seed=0):
+    """(vx, vy) hip->shoulder vectors from random (4,3) [y, x, score] torso arrays (LS, RS, LH, RH)."""
+    rng = np.random.default_rng(seed)
+    out = []
+    for _ in range(n):
+        t = rng.random((4, 3)).astype(np.float32).tolist()
+        sx, sy = (t[0][1] + t[1][1]) / 2.0, (t[0][0] + t[1][0]) / 2.0
+        hx, hy = (t[2][1] + t[3][1]) / 2.0, (t[2][0] + t[3][0]) / 2.0
+        out.append((sx - hx, sy - hy))
+    return out + [(0.0, 0.0), (0.0005, -0.0005), (0.0, -0.3), (0.3, 0.0)]
+
+class TestKernels(unittest.TestCase):
+    def test_torso_angle_paths_agree(self):
+        for vx, vy in _torso_vectors(500):
+            compiled = _kernels.torso_angle(vx, vy)
+            python = _py(_kernels.torso_angle)(vx, vy)
+            self.assertAlmostEqual(compiled, python, places=6)
+            if abs(vx) >= 0.001 or abs(vy) >= 0.001:
+                ref = 90.0 - math.degrees(float(np.arctan2(abs(vx), abs(vy))))
+                self.assertAlmostEqual(compiled, min(90.0, max(0.0, ref)), places=6)
+            else:
+                self.assertEqual(compiled, 0.0)
+            self.assertTrue(0.0 <= compiled <= 90.0)
+
+    def test_motion_magnitude_paths_agree(self):
+        rng = np.random.default_rng(1)
+        for hx, hy, sx, sy in rng.normal(0, 0.1, (500, 4)).tolist():
+            compiled = _kernels.motion_magnitude(hx, hy, sx, sy)
+            self.assertAlmostEqual(compiled, _py(_kernels.motion_magnitude)(hx, hy, sx, sy), places=9)
+            self.assertAlmostEqual(compiled, float(np.hypot(hx, hy) + np.hypot(sx, sy)), places=9)
+
+    def test_immobile_check_paths_agree(self):
+        rng = np.random.default_rng(2)
+        self.assertFalse(_kernels.immobile_check(np.zeros(0), 0.1))
+        self.assertFalse(_py(_kernels.immobile_check)(np.zeros(0), 0.1))
+        for n in (1, 5, 150):
+            arr = rng.random(n) * 0.2
+            for eps in (0.05, 0.1, 0.15):
+                compiled = bool(_kernels.immobile_check(arr, eps))
+                self.assertEqual(compiled, bool(_py(_kernels.immobile_check)(arr, eps)))
+                self.assertEqual(compiled, bool(arr.mean() < eps))
+
+if __name__ == '__main__':
+    unittest.main()
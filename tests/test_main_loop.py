@@ -0,0 +1,115 @@
+import os
+import signal
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import yaml
+
+from src.shared.pose import PoseResult
+try:
+    import cv2  # type: ignore  # noqa: F401
+    import src.main as main
+    CV2_AVAILABLE = main.CV2_AVAILABLE
+except Exception:
+    CV2_AVAILABLE = False
+
+FPS = 15
+
+class FakeCapture:
+    """cv2.VideoCapture stand-in delivering frames at FPS."""
+    def __init__(self, *args, **kwargs):
+        import numpy as np
+        self._frame = np.zeros((240, 320, 3), dtype=np.uint8)
+        self._next = time.monotonic()
+    def isOpened(self):
+        return True
+    def set(self, *args):
+        return True
+    def get(self, prop):
+        return 0
+    def grab(self):
+        self._next += 1.0 / FPS
+        delay = self._next - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        return True
+    def retrieve(self):
+        return True, self._frame
+    def release(self):
+        pass
+
+class CountingBackend:
+    def __init__(self):
+        self.calls = 0
+    def infer(self, frame):
+        self.calls += 1
+        return PoseResult({}, 0.0, time.time())
+
+@unittest.skipUnless(CV2_AVAILABLE, "cv2 not available")
+class TestFrameSkipping(unittest.TestCase):
+    def _run(self, seconds: float = 3.0, **backend_cfg):
+        """Run the main loop on a fake camera; returns (inference count, ts of poses fed to the risk engine)."""
+        tmp = tempfile.mkdtemp()
+        cfg = {
+            "backend": dict({"type": "movenet_tflite", "motion_skip_eps": 0.0, "temporal_skip": 1}, **backend_cfg),
+            "camera": {"enabled": True, "fps": FPS, "release_when_idle": False},
+            "pir_activation": {"enabled": False},
+            "led_indicators": {"enabled": False},
+            "telegram": {"type": "dummy"},
+            "logging": {"status_debug": False},
+            "pid_file": os.path.join(tmp, "duruon.pid"),
+        }
+        path = os.path.join(tmp, "config.yaml")
+        with open(path, "w") as f:
+            yaml.safe_dump(cfg, f)
+        backend = CountingBackend()
+        fed = []
+        update = main.RiskEngine.update
+        def counting_update(engine, pose):
+            fed.append(pose.ts)
+            return update(engine, pose)
+        handlers = {s: signal.getsignal(s) for s in (signal.SIGINT, signal.SIGTERM)}
+        timer = threading.Timer(seconds, os.kill, (os.getpid(), signal.SIGINT))
+        try:
+            with mock.patch.object(main.cv2, "VideoCapture", FakeCapture), \
+                 mock.patch.object(main, "make_backend", lambda _cfg: backend), \
+                 mock.patch.object(main.RiskEngine, "update", counting_update):
+                timer.start()
+                main.run(path)
+        finally:
+            timer.cancel()
+            for s, h in handlers.items():
+                signal.signal(s, h)
+        return backend.calls, fed
+
+    def test_temporal_skip_reduces_inference_rate(self):
+        full, _ = self._run(temporal_skip=1)
+        halved, _ = self._run(temporal_skip=2)
+        self.assertGreater(full, 0)
+        # Every second camera frame is dropped, not just delayed
+        self.assertLess(halved, full * 0.65)
+        self.assertGreater(halved, full * 0.35)
+
+    def test_motion_skip_feeds_only_fresh_poses(self):
+        # The fake camera repeats one frame, so nearly every pass reuses the last pose
+        calls, fed = self._run(motion_skip_eps=3.0)
+        self.assertGreater(calls, 0)
+        self.assertEqual(len(fed), len(set(fed)))  # no pose fed twice (zero-motion samples)
+        self.assertLessEqual(len(fed), calls)
+
+@unittest.skipUnless(CV2_AVAILABLE, "cv2 not available")
+class TestInferPadded(unittest.TestCase):
+    def test_partial_batch_keeps_batch_size(self):
+        seen = []
+        def infer_batch(frames, timestamps):
+            seen.append(len(frames))
+            return list(timestamps)
+        self.assertEqual(main._infer_padded(infer_batch, [1, 2], [0.1, 0.2], 4), [0.1, 0.2])
+        self.assertEqual(main._infer_padded(infer_batch, [1, 2, 3, 4], [1, 2, 3, 4], 4), [1, 2, 3, 4])
+        self.assertEqual(seen, [4, 4])
+
+if __name__ == '__main__':
+    unittest.main()
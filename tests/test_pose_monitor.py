@@ -0,0 +1,62 @@
+import unittest
+from pose_monitor import PoseMonitor
+
+PREFIX = "Jan 01 12:00:00 pi python[123]: "
+
+class TestPoseMonitorParser(unittest.TestCase):
+    def setUp(self):
+        self.mon = PoseMonitor()
+
+    def test_active_with_pose(self):
+        d = self.mon.parse_log_line(PREFIX + "🔍 ACTIVE: frames=42, present=True, event=None, "
+                                    "torso_angle=78.5°, vx=0.012, vy=-0.210")
+        self.assertIsNotNone(d)
+        self.assertEqual(d.state, 'ACTIVE')
+        self.assertEqual(d.frames, 42)
+        self.assertTrue(d.present)
+        self.assertAlmostEqual(d.torso_angle, 78.5)
+        self.assertAlmostEqual(d.vx, 0.012)
+        self.assertAlmostEqual(d.vy, -0.210)
+        self.assertIsNone(d.event)
+        self.assertIsNotNone(d.timestamp)
+
+    def test_active_no_person(self):
+        d = self.mon.parse_log_line(PREFIX + "🔍 ACTIVE: frames=7, present=False, event=None, no person detected")
+        self.assertEqual(d.state, 'ACTIVE')
+        self.assertEqual(d.frames, 7)
+        self.assertFalse(d.present)
+        self.assertEqual(d.torso_angle, 0.0)
+
+    def test_idle(self):
+        d = self.mon.parse_log_line(PREFIX + "💤 IDLE: frames=100, PIR monitoring=False")
+        self.assertEqual(d.state, 'IDLE')
+        self.assertEqual(d.frames, 100)
+        self.assertFalse(d.present)
+
+    def test_event(self):
+        d = self.mon.parse_log_line(PREFIX + "🔍 ACTIVE: frames=9, present=True, event=hard_fall, "
+                                    "torso_angle=12.0°, vx=0.300, vy=-0.010")
+        self.assertEqual(d.event, 'hard_fall')
+        self.assertAlmostEqual(d.torso_angle, 12.0)
+
+    def test_state_hint_skips_tag_detection(self):
+        d = self.mon.parse_log_line(PREFIX + "💤 IDLE: frames=3, PIR monitoring=True", 'IDLE')
+        self.assertEqual((d.state, d.frames), ('IDLE', 3))
+
+    def test_malformed_lines(self):
+        for line in (
+            "unrelated journal line",
+            PREFIX + "🔍 ACTIVE: present=True, event=None",          # no frames
+            PREFIX + "🔍 ACTIVE: frames=abc, present=True",          # bad int
+            PREFIX + "🔍 ACTIVE: frames=5, torso_angle=x°, vx=0.1",  # bad float
+        ):
+            self.assertIsNone(self.mon.parse_log_line(line), line)
+
+    def test_malformed_line_keeps_previous_result(self):
+        d = self.mon.parse_log_line(PREFIX + "🔍 ACTIVE: frames=5, present=True, event=None, "
+                                    "torso_angle=60.0°, vx=0.000, vy=-0.100")
+        self.assertIsNone(self.mon.parse_log_line(PREFIX + "🔍 ACTIVE: frames=6, torso_angle=bad°"))
+        self.assertEqual((d.frames, d.torso_angle, d.present), (5, 60.0, True))
+
+if __name__ == '__main__':
+    unittest.main()